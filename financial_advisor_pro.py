@@ -4,7 +4,7 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import re
@@ -13,10 +13,22 @@ from io import StringIO
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from sklearn.preprocessing import MinMaxScaler
+from scipy.optimize import linprog, minimize
 import time
 import json
 import os
+import sys
+import random
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
 import tensorflow as tf
+from signal_engine import (
+    BACKTEST_SLIPPAGE, INDICATOR_COLUMNS, SIGNAL_INPUTS, _forward_fill, backtest_signals,
+    calculate_indicator_matrix, calculate_signal_components, run_sweep, sweep_grid
+)
 def save_login_details(name, phone, occupation):
     """Save login details to a CSV file."""
     file_path = "data/login_details.csv"
@@ -629,106 +641,905 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Cache data fetching functions
-@st.cache_data(ttl=300)  # 5 minutes cache
-def get_stock_data(symbol, period='6mo', max_retries=3):
-    """Fetch stock data for the given symbol and period."""
+# Concurrent fetching: yfinance calls run on a small shared worker pool
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 10  # seconds allowed for a single yfinance request
+PAGE_FETCH_TIMEOUT = 30  # seconds a page waits for a parallel batch of fetches
+
+# Problems hit on a worker thread are collected here and shown by the page
+_fetch_messages = threading.local()
+
+@st.cache_resource
+def get_fetch_executor():
+    """Return the worker pool shared by all sessions for market data requests."""
+    return ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="market-data")
+
+def report_fetch_problem(level, message):
+    """Show a fetch warning or error, or collect it when running on a worker thread."""
+    messages = getattr(_fetch_messages, 'messages', None)
+    if messages is None:
+        getattr(st, level)(message)
+    else:
+        messages.append((level, message))
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    """Return a jittered exponential backoff delay (in seconds) for a retry."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def fetch_with_retries(fetch, description, max_retries=3):
+    """Call fetch until it returns a non-empty result, backing off between attempts.
+
+    Returns None when every attempt failed.
+    """
     for attempt in range(max_retries):
         try:
-            # Add .NS suffix if not present for Indian stocks
-            if not symbol.endswith(('.NS', '.BO', '^NSEI', '^BSESN')):
-                symbol = f"{symbol}.NS"
-            
-            stock = yf.Ticker(symbol)
-            data = stock.history(period=period)
-            
-            if data.empty:
-                st.warning(f"Attempt {attempt + 1}: No data available for {symbol}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                continue
-                
-            return data
+            result = fetch()
+            if result is not None and len(result) > 0:
+                return result
+            report_fetch_problem('warning', f"Attempt {attempt + 1}: No {description} available")
         except Exception as e:
-            st.warning(f"Attempt {attempt + 1}: Error fetching data for {symbol}: {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-    
-    st.error(f"Failed to fetch data for {symbol} after {max_retries} attempts")
+            report_fetch_problem('warning', f"Attempt {attempt + 1}: Error fetching {description}: {str(e)}")
+
+        if attempt < max_retries - 1:
+            time.sleep(backoff_delay(attempt))
+    return None
+
+def submit_fetch(fetch):
+    """Run a fetch call on the worker pool; the future yields (result, messages)."""
+    def run():
+        messages = []
+        _fetch_messages.messages = messages
+        try:
+            return fetch(), messages
+        finally:
+            _fetch_messages.messages = None
+
+    return get_fetch_executor().submit(run)
+
+def fetch_in_parallel(calls, defaults=None, timeout=PAGE_FETCH_TIMEOUT):
+    """Run several fetch calls concurrently and return their results by name.
+
+    The page waits at most `timeout` seconds for the whole batch. Calls that
+    have not finished by then return their default and keep running in the
+    background, so the caches are still filled for the next rerun.
+    """
+    defaults = defaults or {}
+    futures = {name: submit_fetch(call) for name, call in calls.items()}
+    deadline = time.monotonic() + timeout
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            result, messages = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            report_fetch_problem('warning', f"Timed out fetching {name}")
+            results[name] = defaults.get(name)
+            continue
+        except Exception as e:
+            report_fetch_problem('error', f"Error fetching {name}: {str(e)}")
+            results[name] = defaults.get(name)
+            continue
+
+        for level, message in messages:
+            report_fetch_problem(level, message)
+        results[name] = result
+    return results
+
+# Local price store: one Parquet file of daily OHLCV bars per symbol
+PRICE_STORE_DIR = os.path.join("data", "price_store")
+
+# Lookback periods ordered from shortest to longest ('max' has no start date)
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '3y': pd.DateOffset(years=3),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+    'max': None
+}
+
+# Periods accepted by yfinance; others are downloaded with the next longer one
+YFINANCE_PERIODS = ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'max']
+
+# Market data providers: the app talks to yfinance only through these classes, so
+# benchmarks and load tests can swap in the offline replay provider
+class MarketDataProvider:
+    """Source of price history, company information and news."""
+
+    name = "base"
+    store_dir = PRICE_STORE_DIR
+
+    def history(self, symbol, period=None, start=None):
+        """Return daily OHLCV bars for a lookback period or since a start date."""
+        raise NotImplementedError
+
+    def download(self, symbols, period=None, start=None):
+        """Return the history of several symbols, keyed by symbol."""
+        return {symbol: self.history(symbol, period=period, start=start) for symbol in symbols}
+
+    def info(self, symbol):
+        """Return the company information dictionary of a symbol."""
+        raise NotImplementedError
+
+    def news(self, symbol):
+        """Return the recent news items of a symbol."""
+        raise NotImplementedError
+
+class YFinanceProvider(MarketDataProvider):
+    """Live market data from Yahoo Finance."""
+
+    name = "yfinance"
+
+    def history(self, symbol, period=None, start=None):
+        range_args = {'start': start} if start else {'period': period}
+        return yf.Ticker(symbol).history(timeout=FETCH_TIMEOUT, **range_args)
+
+    def download(self, symbols, period=None, start=None):
+        """Download several symbols in one yfinance request, split per symbol."""
+        range_args = {'start': start} if start else {'period': period}
+        batch = yf.download(list(symbols), group_by='ticker', auto_adjust=True, actions=True,
+                            progress=False, timeout=FETCH_TIMEOUT, **range_args)
+        frames = {}
+        for symbol in symbols:
+            if isinstance(batch.columns, pd.MultiIndex):
+                if symbol not in batch.columns.get_level_values(0):
+                    frames[symbol] = pd.DataFrame()
+                    continue
+                frame = batch[symbol]
+            else:
+                frame = batch
+            frames[symbol] = frame.dropna(how='all').copy()
+        return frames
+
+    def info(self, symbol):
+        return yf.Ticker(symbol).info
+
+    def news(self, symbol):
+        return yf.Ticker(symbol).news
+
+class ReplayProvider(MarketDataProvider):
+    """Offline market data served from local files, for benchmarks and load tests.
+
+    The directory may hold history/<SYMBOL>.csv, info/<SYMBOL>.json and
+    news/<SYMBOL>.json (see record_replay_data). Symbols without a recorded
+    history get a reproducible synthetic random walk. Every call waits
+    `latency` seconds and fails with ConnectionError at `failure_rate`.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory, latency=0.0, failure_rate=0.0, seed=0):
+        self.directory = directory
+        self.store_dir = os.path.join(directory, "price_store")
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _simulate_request(self, description):
+        """Apply the configured latency and failure injection to one call."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+        if failed:
+            raise ConnectionError(f"Injected failure fetching {description}")
+
+    def _path(self, kind, symbol, extension):
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.directory, kind, f"{safe_symbol}.{extension}")
+
+    def _synthetic_history(self, symbol):
+        """Generate a reproducible daily random walk for a symbol since 2015."""
+        rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+        dates = pd.bdate_range("2015-01-01", pd.Timestamp.now().normalize(), name="Date")
+        close = rng.uniform(100, 3000) * np.exp(np.cumsum(rng.normal(0.0004, 0.015, len(dates))))
+        open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+        spread = np.abs(rng.normal(0, 0.01, len(dates)))
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) * (1 + spread),
+            'Low': np.minimum(open_, close) * (1 - spread),
+            'Close': close,
+            'Volume': rng.lognormal(13, 0.5, len(dates)).astype(np.int64),
+            'Dividends': 0.0,
+            'Stock Splits': 0.0
+        }, index=dates)
+
+    def _full_history(self, symbol):
+        path = self._path("history", symbol, "csv")
+        if os.path.exists(path):
+            return pd.read_csv(path, index_col=0, parse_dates=True)
+        return self._synthetic_history(symbol)
+
+    def _read_json(self, kind, symbol):
+        path = self._path(kind, symbol, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _select(self, symbol, period, start):
+        data = self._full_history(symbol)
+        if start:
+            return data[data.index >= pd.Timestamp(start)]
+        return slice_period(data, period)
+
+    def history(self, symbol, period=None, start=None):
+        self._simulate_request(f"history for {symbol}")
+        return self._select(symbol, period, start)
+
+    def download(self, symbols, period=None, start=None):
+        # A bulk download costs one simulated round trip, like yf.download
+        self._simulate_request(f"history for {', '.join(symbols)}")
+        return {symbol: self._select(symbol, period, start) for symbol in symbols}
+
+    def info(self, symbol):
+        self._simulate_request(f"information for {symbol}")
+        info = self._read_json("info", symbol)
+        if info is None:
+            last_bar = self._full_history(symbol).iloc[-1]
+            info = {
+                'symbol': symbol,
+                'sector': 'Synthetic',
+                'industry': 'Synthetic',
+                'dayLow': float(last_bar['Low']),
+                'dayHigh': float(last_bar['High']),
+                'volume': int(last_bar['Volume'])
+            }
+        return info
+
+    def news(self, symbol):
+        self._simulate_request(f"news for {symbol}")
+        return self._read_json("news", symbol) or []
+
+def record_replay_data(symbols, directory, period='2y'):
+    """Record live yfinance history, info and news for the replay provider."""
+    live = YFinanceProvider()
+    for kind in ("history", "info", "news"):
+        os.makedirs(os.path.join(directory, kind), exist_ok=True)
+
+    replay = ReplayProvider(directory)
+    for symbol in symbols:
+        _normalize_history(live.history(symbol, period=period)).to_csv(replay._path("history", symbol, "csv"))
+        for kind, fetch in (("info", live.info), ("news", live.news)):
+            with open(replay._path(kind, symbol, "json"), "w") as f:
+                json.dump(fetch(symbol), f, default=str)
+
+@st.cache_resource
+def get_market_data_provider():
+    """Return the market data provider chosen by the MARKET_DATA_PROVIDER setting.
+
+    MARKET_DATA_PROVIDER=replay serves files from MARKET_DATA_REPLAY_DIR, with
+    MARKET_DATA_REPLAY_LATENCY (seconds) and MARKET_DATA_REPLAY_FAILURE_RATE.
+    """
+    if os.environ.get("MARKET_DATA_PROVIDER", "yfinance") == "replay":
+        return ReplayProvider(
+            os.environ.get("MARKET_DATA_REPLAY_DIR", os.path.join("data", "replay")),
+            latency=float(os.environ.get("MARKET_DATA_REPLAY_LATENCY", 0)),
+            failure_rate=float(os.environ.get("MARKET_DATA_REPLAY_FAILURE_RATE", 0))
+        )
+    return YFinanceProvider()
+
+def _price_store_path(symbol):
+    """Return the Parquet file holding the stored history of a symbol."""
+    safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+    return os.path.join(get_market_data_provider().store_dir, f"{safe_symbol}.parquet")
+
+def load_price_store(symbol):
+    """Load the stored price history of a symbol (empty if nothing is stored)."""
+    path = _price_store_path(symbol)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        # A damaged file is simply downloaded again
+        return pd.DataFrame()
+
+def save_price_store(symbol, data):
+    """Write the price history of a symbol to the local store."""
+    path = _price_store_path(symbol)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    # Write to a temporary file first so readers never see a half-written file
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    data.to_parquet(temp_path)
+    os.replace(temp_path, path)
+
+def price_store_saved_at(symbol):
+    """Return the epoch time the stored history of a symbol was last written, or None."""
+    path = _price_store_path(symbol)
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def _normalize_history(data):
+    """Drop the timezone from yfinance bars so stored and new bars line up."""
+    if not data.empty and data.index.tz is not None:
+        data = data.tz_localize(None)
+    data.index.name = 'Date'
+    return data
+
+def period_start(period, end):
+    """Return the first timestamp excluded from a lookback period ending at end."""
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        return None
+    return end - offset
+
+def slice_period(data, period):
+    """Return the bars of a price history that fall inside the lookback period."""
+    if data.empty:
+        return data
+    start = period_start(period, data.index[-1])
+    if start is None:
+        return data
+    return data[data.index > start]
+
+def _download_period(period):
+    """Return the shortest yfinance period that covers the requested one."""
+    if period in YFINANCE_PERIODS:
+        return period
+    periods = list(PERIOD_OFFSETS.keys())
+    if period in periods:
+        for candidate in periods[periods.index(period):]:
+            if candidate in YFINANCE_PERIODS:
+                return candidate
+    return 'max'
+
+def _store_covers(stored, period):
+    """Check whether the stored history reaches back far enough for a period."""
+    if len(stored) < 2:
+        return False
+    start = period_start(period, pd.Timestamp.now().normalize())
+    if start is None:
+        return False
+    # Allow a week of slack for weekends and exchange holidays at the start
+    return stored.index[0] <= start + pd.Timedelta(days=7)
+
+def _store_is_current(symbol):
+    """Check whether the stored history was saved after the last session settled.
+
+    Never true while a session is running: today's bar is missing or still moving.
+    """
+    if is_market_open():
+        return False
+    saved_at = price_store_saved_at(symbol)
+    if saved_at is None:
+        return False
+    return datetime.fromtimestamp(saved_at, IST) >= last_session_settlement()
+
+def _history_was_adjusted(stored, fresh):
+    """Check whether yfinance re-adjusted past prices, e.g. after a split or dividend."""
+    overlap = stored.index[-2]
+    if overlap not in fresh.index:
+        return False
+    return not np.isclose(stored.at[overlap, 'Close'], fresh.at[overlap, 'Close'], rtol=1e-4)
+
+def update_price_store(symbol, period):
+    """Bring the stored history of a symbol up to date and return all of it.
+
+    When the store already covers the requested period only the bars after the
+    last stored date are downloaded; otherwise the full period is fetched once.
+    """
+    stored = load_price_store(symbol)
+    provider = get_market_data_provider()
+
+    if _store_covers(stored, period) and _store_is_current(symbol):
+        # Saved after the last session settled: nothing new can be downloaded
+        return stored
+
+    if _store_covers(stored, period):
+        # Refetch the last two stored bars as well: the final one may have been
+        # partial, and the one before shows whether past prices were re-adjusted
+        fresh = _normalize_history(provider.history(symbol, start=stored.index[-2].strftime('%Y-%m-%d')))
+        if not fresh.empty and _history_was_adjusted(stored, fresh):
+            stored = pd.DataFrame()
+            fresh = _normalize_history(provider.history(symbol, period=_download_period(period)))
+    else:
+        fresh = _normalize_history(provider.history(symbol, period=_download_period(period)))
+
+    return _merge_into_store(symbol, stored, fresh)
+
+def _merge_into_store(symbol, stored, fresh):
+    """Append freshly downloaded bars to the stored history and save it."""
+    if fresh.empty:
+        return stored
+
+    merged = pd.concat([stored, fresh]) if not stored.empty else fresh
+    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+    save_price_store(symbol, merged)
+    return merged
+
+def _download_batch(symbols, **kwargs):
+    """Download several symbols in one provider request, split per symbol."""
+    if not symbols:
+        return {}
+    frames = get_market_data_provider().download(symbols, **kwargs)
+    return {symbol: _normalize_history(frames.get(symbol, pd.DataFrame())) for symbol in symbols}
+
+def update_price_store_batch(symbols, period):
+    """Bring the stored histories of several symbols up to date in bulk.
+
+    Symbols whose store already covers the period share one download of the
+    missing bars; the rest share one download of the full period.
+    """
+    stored = {symbol: load_price_store(symbol) for symbol in symbols}
+    histories = {symbol: stored[symbol] for symbol in symbols
+                 if _store_covers(stored[symbol], period) and _store_is_current(symbol)}
+    symbols = [symbol for symbol in symbols if symbol not in histories]
+    covered = [symbol for symbol in symbols if _store_covers(stored[symbol], period)]
+    missing = [symbol for symbol in symbols if symbol not in covered]
+
+    fresh = {}
+    if covered:
+        start = min(stored[symbol].index[-2] for symbol in covered)
+        fresh.update(_download_batch(covered, start=start.strftime('%Y-%m-%d')))
+    if missing:
+        fresh.update(_download_batch(missing, period=_download_period(period)))
+
+    for symbol in symbols:
+        if symbol in covered and not fresh[symbol].empty and _history_was_adjusted(stored[symbol], fresh[symbol]):
+            # Re-adjusted history has to be downloaded again in full
+            histories[symbol] = update_price_store(symbol, period)
+        else:
+            histories[symbol] = _merge_into_store(symbol, stored[symbol], fresh[symbol])
+    return histories
+
+# Snapshots of company information and news, so a fresh process (or the
+# warm-up job) can hand them to the in-memory cache without a network trip
+def _snapshot_path(kind, symbol):
+    """Return the JSON file holding the snapshot of kind ('info' or 'news') for a symbol."""
+    safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+    snapshot_dir = os.path.join(os.path.dirname(get_market_data_provider().store_dir), "snapshots")
+    return os.path.join(snapshot_dir, kind, f"{safe_symbol}.json")
+
+def load_snapshot(kind, symbol):
+    """Load a snapshot as a dict with value, fetched_at and expires_at, or None."""
+    path = _snapshot_path(kind, symbol)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def save_snapshot(kind, symbol, value, expires_at):
+    """Write a snapshot of kind for a symbol, valid until expires_at."""
+    path = _snapshot_path(kind, symbol)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump({'value': value, 'fetched_at': time.time(), 'expires_at': expires_at}, f, default=str)
+    os.replace(temp_path, path)
+
+def normalize_symbol(symbol):
+    """Add the .NS suffix if not present for Indian stocks."""
+    if not symbol.endswith(('.NS', '.BO', '^NSEI', '^BSESN')):
+        symbol = f"{symbol}.NS"
+    return symbol
+
+# NSE trading calendar, used to decide how long market data stays valid.
+# Exchange holidays are read from data/nse_holidays.csv (one 'date' column).
+IST = timezone(timedelta(hours=5, minutes=30))
+NSE_OPEN = timedelta(hours=9, minutes=15)
+NSE_CLOSE = timedelta(hours=15, minutes=30)
+NSE_SETTLEMENT_DELAY = timedelta(minutes=30)  # final daily bars can lag the close
+NSE_HOLIDAYS_FILE = os.path.join("data", "nse_holidays.csv")
+INTRADAY_TTL = 300  # seconds intraday quotes stay valid while the market is open
+
+@st.cache_resource
+def load_nse_holidays():
+    """Load the NSE holiday dates (empty if no holiday file is present)."""
+    if not os.path.exists(NSE_HOLIDAYS_FILE):
+        return frozenset()
+    holidays = pd.read_csv(NSE_HOLIDAYS_FILE, parse_dates=['date'])
+    return frozenset(holidays['date'].dt.date)
+
+def is_trading_day(day):
+    """Check whether NSE holds a session on the given date."""
+    return day.weekday() < 5 and day not in load_nse_holidays()
+
+def _session_start(day):
+    """Return midnight IST of a date."""
+    return datetime(day.year, day.month, day.day, tzinfo=IST)
+
+def is_market_open(now=None):
+    """Check whether NSE prices can still change: session hours plus settlement."""
+    now = now or datetime.now(IST)
+    if not is_trading_day(now.date()):
+        return False
+    midnight = _session_start(now.date())
+    return midnight + NSE_OPEN <= now < midnight + NSE_CLOSE + NSE_SETTLEMENT_DELAY
+
+def _next_session_time(now, offset):
+    """Return the first session open/settlement time (offset from midnight) after now."""
+    day = now.date()
+    while True:
+        moment = _session_start(day) + offset
+        if is_trading_day(day) and moment > now:
+            return moment
+        day += timedelta(days=1)
+
+def last_session_settlement(now=None):
+    """Return when the most recent NSE session's daily bars became final."""
+    now = now or datetime.now(IST)
+    day = now.date()
+    while True:
+        moment = _session_start(day) + NSE_CLOSE + NSE_SETTLEMENT_DELAY
+        if is_trading_day(day) and moment <= now:
+            return moment
+        day -= timedelta(days=1)
+
+def cache_expiry(kind, now=None):
+    """Return the epoch time until which data fetched now stays valid.
+
+    Daily history ('history') and intraday data ('intraday') follow the same
+    clock: during market hours, when today's daily bar is still moving, they get
+    a short TTL; data fetched after the last session settled cannot change
+    before the next session opens.
+    """
+    now = now or datetime.now(IST)
+    if is_market_open(now):
+        return now.timestamp() + INTRADAY_TTL
+    return _next_session_time(now, NSE_OPEN).timestamp()
+
+# Shared in-memory cache: keeps the widest history fetched per symbol so every
+# shorter lookback period is served by slicing it, without another download.
+# Expired entries are still served at once while a worker refreshes them, and
+# concurrent requests for the same key share a single upstream call.
+# The cache holds at most MARKET_DATA_CACHE_MB megabytes and evicts the least
+# recently used entries beyond that.
+MARKET_DATA_TTL = 300  # 5 minutes cache
+MARKET_DATA_CACHE_BYTES = int(float(os.environ.get("MARKET_DATA_CACHE_MB", "256")) * 1024 * 1024)
+
+def _value_nbytes(value):
+    """Estimate the memory used by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, tuple):
+        return sum(_value_nbytes(item) for item in value)
+    if isinstance(value, go.Figure):
+        # The trace arrays dominate a figure's size
+        return sum(
+            getattr(getattr(trace, axis, None), 'nbytes', 0)
+            for trace in value.data
+            for axis in ('x', 'y')
+        )
+    return len(json.dumps(value, default=str))
+
+def _share(value):
+    """Return a view of a cached value that shares its data without copying it.
+
+    Callers get their own frame object, so adding or replacing columns never
+    reaches the cache; writing into the values in place would, so paths that
+    need that must copy() first.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    return value
+
+class MarketDataCache:
+    """Thread-safe, stale-while-revalidate LRU cache of market data shared by all sessions."""
+
+    def __init__(self, ttl=MARKET_DATA_TTL, max_bytes=MARKET_DATA_CACHE_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0}
+        self._in_flight = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """Return the cache entry for key (fresh or not), or None.
+
+        The entry holds a view of the cached value, not the cached object.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+        return dict(entry, value=_share(entry['value']))
+
+    def peek(self, key, field):
+        """Return one metadata field of an entry without counting it as a use."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry.get(field)
+
+    def is_fresh(self, entry):
+        """Check whether a cache entry has not expired yet."""
+        if time.time() < entry['expires_at']:
+            return True
+        with self._lock:
+            self._counters['stale'] += 1
+        return False
+
+    def stats(self):
+        """Return the hit, miss, stale and eviction counts and the memory in use."""
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), bytes=self._nbytes, max_bytes=self.max_bytes)
+
+    def put(self, key, value, expires_at=None, fetched_at=None, **metadata):
+        """Store a value with the time it was fetched and when it expires.
+
+        Both times are epoch times; by default the value was fetched now and
+        lives for the TTL.
+        """
+        fetched_at = fetched_at or time.time()
+        if expires_at is None:
+            expires_at = fetched_at + self.ttl
+        nbytes = _value_nbytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old['nbytes']
+            self._entries[key] = dict(metadata, value=value, fetched_at=fetched_at, expires_at=expires_at, nbytes=nbytes)
+            self._nbytes += nbytes
+            # Evict least recently used entries, but always keep the newest one
+            while self._nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted['nbytes']
+                self._counters['evictions'] += 1
+
+    def fetch_once(self, key, fetch):
+        """Call fetch, sharing one call among all threads asking for the same key.
+
+        Callers that arrive while a fetch for key is running wait for it and
+        receive its result instead of starting their own request.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fetch()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def refresh_in_background(self, key, fetch):
+        """Run fetch for key on the worker pool unless a refresh is already queued."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.fetch_once(key, fetch)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        submit_fetch(refresh)
+
+@st.cache_resource
+def get_market_data_cache():
+    """Return the market data cache shared by all sessions."""
+    return MarketDataCache()
+
+def _period_rank(period):
+    """Return the position of a period from shortest to longest (unknown = 'max')."""
+    periods = list(PERIOD_OFFSETS.keys())
+    return periods.index(period) if period in periods else len(periods) - 1
+
+def _widest_period(*periods):
+    """Return the longest of several lookback periods."""
+    return max(periods, key=_period_rank)
+
+def _history_fetch(cache, symbol, period, description, max_retries):
+    """Return a call that brings the history of symbol up to date and caches it."""
+    def fetch():
+        history = fetch_with_retries(lambda: update_price_store(symbol, period), description, max_retries)
+        if history is not None:
+            # The store was written when the bars were downloaded, which may be
+            # well before this call when it was already current
+            cache.put(('history', symbol), history, expires_at=cache_expiry('history'),
+                      fetched_at=price_store_saved_at(symbol), period=period)
+        return history
+
+    return fetch
+
+def _cached_history(cache, symbol, period, description="", max_retries=3):
+    """Return a cached history of symbol that covers period, or None.
+
+    A stale history is still returned; it is refreshed in the background.
+    """
+    entry = cache.lookup(('history', symbol))
+    if entry is None or _period_rank(entry['period']) < _period_rank(period):
+        return None
+
+    if not cache.is_fresh(entry):
+        cache.refresh_in_background(
+            ('history', symbol, entry['period']),
+            _history_fetch(cache, symbol, entry['period'], description or f"data for {symbol}", max_retries)
+        )
+    return entry['value']
+
+def _fetch_period(cache, symbol, period):
+    """Return the period to download: the request widened to what is already cached."""
+    cached_period = cache.peek(('history', symbol), 'period')
+    return period if cached_period is None else _widest_period(period, cached_period)
+
+def _get_history(symbol, period, description, max_retries=3):
+    """Get the history of a symbol for a period, sliced from the widest cached window."""
+    cache = get_market_data_cache()
+    history = _cached_history(cache, symbol, period, description, max_retries)
+    if history is not None:
+        return slice_period(history, period)
+
+    fetch_period = _fetch_period(cache, symbol, period)
+    history = cache.fetch_once(
+        ('history', symbol, fetch_period),
+        _history_fetch(cache, symbol, fetch_period, description, max_retries)
+    )
+    if history is not None:
+        return slice_period(history, period)
+
+    # Fall back to whatever is stored locally when yfinance is unreachable
+    stored = slice_period(load_price_store(symbol), period)
+    if not stored.empty:
+        report_fetch_problem('warning', f"Could not refresh {symbol}; showing stored data up to {stored.index[-1]:%Y-%m-%d}")
+        return stored
+
+    report_fetch_problem('error', f"Failed to fetch {description} after {max_retries} attempts")
     return pd.DataFrame()
 
-@st.cache_data(ttl=300)
+def _get_snapshot(kind, symbol, fetch_value):
+    """Get info or news for a symbol from the cache, its snapshot or fetch_value.
+
+    Stale values are still returned and refreshed in the background; None is
+    returned when nothing is cached and fetch_value returns None.
+    """
+    cache = get_market_data_cache()
+    key = (kind, symbol)
+
+    def fetch():
+        value = fetch_value()
+        if value is not None:
+            expires_at = cache_expiry('intraday')
+            cache.put(key, value, expires_at=expires_at)
+            save_snapshot(kind, symbol, value, expires_at)
+        return value
+
+    entry = cache.lookup(key)
+    if entry is None:
+        entry = load_snapshot(kind, symbol)
+        if entry is not None:
+            cache.put(key, entry['value'], expires_at=entry['expires_at'], fetched_at=entry['fetched_at'])
+    if entry is not None:
+        if not cache.is_fresh(entry):
+            cache.refresh_in_background(key, fetch)
+        return entry['value']
+
+    return cache.fetch_once(key, fetch)
+
+# Data fetching functions
+def get_stock_data(symbol, period='6mo', max_retries=3):
+    """Fetch stock data for the given symbol and period."""
+    symbol = normalize_symbol(symbol)
+    return _get_history(symbol, period, f"data for {symbol}", max_retries)
+
+def _close_price_matrix(histories, period):
+    """Combine per-symbol histories into one Close-price frame aligned on date."""
+    prices = pd.DataFrame({
+        symbol: slice_period(history, period)['Close']
+        for symbol, history in histories.items()
+        if not history.empty
+    })
+    return prices.sort_index()
+
+def get_close_prices(symbols, period='1y', max_retries=3):
+    """Fetch aligned Close prices (one column per symbol) with a bulk download.
+
+    Symbols already cached for the period are served from memory; the rest are
+    fetched together in one request.
+    """
+    symbols = list(dict.fromkeys(normalize_symbol(symbol) for symbol in symbols))
+    cache = get_market_data_cache()
+
+    histories = {symbol: _cached_history(cache, symbol, period) for symbol in symbols}
+    to_fetch = [symbol for symbol, history in histories.items() if history is None]
+
+    if to_fetch:
+        fetch_period = _widest_period(*(_fetch_period(cache, symbol, period) for symbol in to_fetch))
+        description = f"data for {', '.join(to_fetch)}"
+
+        def fetch():
+            fetched = fetch_with_retries(lambda: update_price_store_batch(to_fetch, fetch_period), description, max_retries)
+            for symbol, history in (fetched or {}).items():
+                if not history.empty:
+                    cache.put(('history', symbol), history, expires_at=cache_expiry('history'),
+                              fetched_at=price_store_saved_at(symbol), period=fetch_period)
+            return fetched
+
+        fetched = cache.fetch_once(('history', tuple(to_fetch), fetch_period), fetch)
+        if fetched is None:
+            # Fall back to whatever is stored locally when yfinance is unreachable
+            fetched = {symbol: load_price_store(symbol) for symbol in to_fetch}
+            if any(not history.empty for history in fetched.values()):
+                report_fetch_problem('warning', "Could not refresh prices; showing stored data")
+            else:
+                report_fetch_problem('error', f"Failed to fetch {description} after {max_retries} attempts")
+        histories.update(fetched)
+
+    prices = _close_price_matrix(histories, period)
+    missing = [symbol for symbol in symbols if symbol not in prices.columns]
+    if missing and not prices.empty:
+        report_fetch_problem('warning', f"No data available for {', '.join(missing)}")
+    return prices
+
 def get_stock_info(symbol, max_retries=3):
     """Get detailed information about a stock."""
-    for attempt in range(max_retries):
-        try:
-            # Add .NS suffix if not present for Indian stocks
-            if not symbol.endswith(('.NS', '.BO', '^NSEI', '^BSESN')):
-                symbol = f"{symbol}.NS"
-            
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            
-            if not info:
-                st.warning(f"Attempt {attempt + 1}: No information available for {symbol}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                continue
-                
-            return info
-        except Exception as e:
-            st.warning(f"Attempt {attempt + 1}: Error fetching information for {symbol}: {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-    
-    st.error(f"Failed to fetch information for {symbol} after {max_retries} attempts")
+    symbol = normalize_symbol(symbol)
+    info = _get_snapshot('info', symbol, lambda: fetch_with_retries(
+        lambda: get_market_data_provider().info(symbol), f"information for {symbol}", max_retries
+    ))
+    if info is not None:
+        return info
+
+    report_fetch_problem('error', f"Failed to fetch information for {symbol} after {max_retries} attempts")
     return {}
 
-@st.cache_data(ttl=300)
+def get_stock_news(symbol):
+    """Get the recent news items of a stock (an empty list if there are none)."""
+    return _get_snapshot('news', symbol, lambda: get_market_data_provider().news(symbol) or [])
+
+def get_data_timestamp(symbol, kind='history'):
+    """Return when the cached data of a symbol was fetched, or None if not cached.
+
+    kind is 'history' for prices or 'info' for company information.
+    """
+    fetched_at = get_market_data_cache().peek((kind, normalize_symbol(symbol)), 'fetched_at')
+    if fetched_at is None:
+        return None
+    return datetime.fromtimestamp(fetched_at, IST)
+
 def get_nifty_data(period='1y', max_retries=3):
     """Get NIFTY 50 index data."""
-    for attempt in range(max_retries):
-        try:
-            nifty = yf.Ticker("^NSEI")
-            data = nifty.history(period=period)
-            
-            if data.empty:
-                st.warning(f"Attempt {attempt + 1}: No NIFTY data available")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                continue
-                
-            return data
-        except Exception as e:
-            st.warning(f"Attempt {attempt + 1}: Error fetching NIFTY data: {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-    
-    st.error(f"Failed to fetch NIFTY data after {max_retries} attempts")
-    return pd.DataFrame()
+    return _get_history("^NSEI", period, "NIFTY data", max_retries)
 
-@st.cache_data(ttl=300)
 def get_sensex_data(period='1y', max_retries=3):
     """Get SENSEX index data."""
-    for attempt in range(max_retries):
-        try:
-            sensex = yf.Ticker("^BSESN")
-            data = sensex.history(period=period)
-            
-            if data.empty:
-                st.warning(f"Attempt {attempt + 1}: No SENSEX data available")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                continue
-                
-            return data
-        except Exception as e:
-            st.warning(f"Attempt {attempt + 1}: Error fetching SENSEX data: {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-    
-    st.error(f"Failed to fetch SENSEX data after {max_retries} attempts")
-    return pd.DataFrame()
+    return _get_history("^BSESN", period, "SENSEX data", max_retries)
+
+def get_market_indices(period='1y'):
+    """Fetch NIFTY 50 and SENSEX data in parallel."""
+    indices = fetch_in_parallel(
+        {
+            "NIFTY data": partial(get_nifty_data, period=period),
+            "SENSEX data": partial(get_sensex_data, period=period)
+        },
+        defaults={"NIFTY data": pd.DataFrame(), "SENSEX data": pd.DataFrame()}
+    )
+    return indices["NIFTY data"], indices["SENSEX data"]
 
 def search_indian_stocks(query):
     """Search Indian stocks by name."""
@@ -784,25 +1595,100 @@ def calculate_all_indicators(data):
     if data.empty:
         return data
     
-    result = data.copy()
-    
-    # Calculate RSI
-    result['RSI'] = calculate_rsi(data)
-    
-    # Calculate MACD
-    macd_data = calculate_macd(data)
-    for col in macd_data.columns:
-        result[col] = macd_data[col]
-    
-    # Calculate Bollinger Bands
-    bb_data = calculate_bollinger_bands(data)
-    for col in bb_data.columns:
-        result[col] = bb_data[col]
-    
-    # Calculate Simple Moving Averages
-    result['SMA_50'] = data['Close'].rolling(window=50).mean()
-    result['SMA_200'] = data['Close'].rolling(window=200).mean()
-    
+    indicators = calculate_indicator_matrix(data['Close'].to_numpy(dtype=float))
+    return _with_indicators(data, indicators)
+
+def close_price_array(prices):
+    """Turn a date x symbol Close-price frame into a forward-filled symbols x bars array."""
+    return _forward_fill(prices.to_numpy(dtype=float).T)
+
+# Bar timeframes built from the daily history: weeks end on Friday
+TIMEFRAMES = {
+    '1d': ("Daily", None),
+    '1wk': ("Weekly", pd.offsets.Week(weekday=4)),
+    '1mo': ("Monthly", pd.offsets.MonthEnd())
+}
+
+# Daily history the indicators of each timeframe are calculated on before
+# being cut to the displayed period, so SMA_200 has 200 bars to start from
+INDICATOR_HISTORY = {
+    '1d': '2y',
+    '1wk': '5y',
+    '1mo': 'max'
+}
+
+# How each OHLCV column is combined into a longer bar
+OHLCV_AGGREGATIONS = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+    'Dividends': 'sum',
+    'Stock Splits': 'max'
+}
+
+def resample_ohlcv(data, timeframe='1d'):
+    """Resample daily OHLCV bars to weekly ('1wk') or monthly ('1mo') bars.
+
+    Each bar is dated by its last trading day, so the current, unfinished
+    week or month ends at the latest daily bar.
+    """
+    rule = TIMEFRAMES[timeframe][1]
+    if rule is None or data.empty:
+        return data
+
+    aggregations = {column: how for column, how in OHLCV_AGGREGATIONS.items() if column in data.columns}
+    bars = data.resample(rule).agg(aggregations)
+    bars.index = data.index.to_series().resample(rule).last()
+    return bars[bars.index.notna()].dropna(subset=['Close'])
+
+def _with_indicators(data, indicators):
+    """Append indicator arrays to a price history as columns, in one concat."""
+    return pd.concat([data, pd.DataFrame(indicators, index=data.index)], axis=1)
+
+def analyze_indicators(data, names=INDICATOR_COLUMNS, timeframe='1d', **params):
+    """Calculate the indicators and trading signals of a price history in one pass.
+
+    Daily bars are first resampled to the timeframe ('1d', '1wk' or '1mo').
+    Returns (bars with the named indicator columns, frame of the signal
+    columns only).
+    """
+    data = resample_ohlcv(data, timeframe)
+    if data.empty:
+        return data, pd.DataFrame(index=data.index)
+    close = data['Close'].to_numpy(dtype=float)
+    indicators = calculate_indicator_matrix(close, list(dict.fromkeys([*names, *SIGNAL_INPUTS])), **params)
+    signals = calculate_signal_components(close, indicators)
+    return _with_indicators(data, {name: indicators[name] for name in names}), pd.DataFrame(signals, index=data.index)
+
+# Indicator results are memoized per price history, so reruns caused by widget
+# changes on an unchanged history never recompute technicals
+INDICATOR_CACHE_BYTES = int(float(os.environ.get("INDICATOR_CACHE_MB", "64")) * 1024 * 1024)
+
+@st.cache_resource
+def get_indicator_cache():
+    """Return the cache of computed indicators shared by all sessions."""
+    return MarketDataCache(max_bytes=INDICATOR_CACHE_BYTES)
+
+def analyze_stock(symbol, data, names=INDICATOR_COLUMNS, timeframe='1d', **params):
+    """Run analyze_indicators on the daily history of a symbol, reusing earlier results.
+
+    Results are keyed on the last bar (timestamp and close), the number of
+    bars, the timeframe and the indicator parameters, so they never need to
+    expire.
+    """
+    if data.empty:
+        return analyze_indicators(data, names, timeframe, **params)
+
+    key = ('indicators', symbol, data.index[-1], float(data['Close'].iloc[-1]), len(data), tuple(names), timeframe, tuple(sorted(params.items())))
+    cache = get_indicator_cache()
+    entry = cache.lookup(key)
+    if entry is not None:
+        return entry['value']
+
+    result = analyze_indicators(data, names, timeframe, **params)
+    cache.put(key, result, expires_at=float('inf'))
     return result
 
 def analyze_sentiment(text):
@@ -820,9 +1706,8 @@ def get_stock_news_sentiment(symbol, company_name):
         # Initialize VADER sentiment analyzer
         analyzer = SentimentIntensityAnalyzer()
         
-        # Get news from Yahoo Finance
-        stock = yf.Ticker(symbol)
-        news_items = stock.news
+        # Get news from the cache or the market data provider
+        news_items = get_stock_news(symbol)
         
         if not news_items:
             return {
@@ -875,7 +1760,7 @@ def get_stock_news_sentiment(symbol, company_name):
                 dates.append(datetime.strptime(date, '%Y-%m-%d'))
             
             except Exception as e:
-                st.warning(f"Skipped processing one news item due to: {str(e)}")
+                report_fetch_problem('warning', f"Skipped processing one news item due to: {str(e)}")
                 continue
         
         if not processed_news:
@@ -922,7 +1807,7 @@ def get_stock_news_sentiment(symbol, company_name):
         }
     
     except Exception as e:
-        st.error(f"Error analyzing sentiment for {company_name}: {str(e)}")
+        report_fetch_problem('error', f"Error analyzing sentiment for {company_name}: {str(e)}")
         # Return neutral default values
         return {
             'overall_sentiment': 0,
@@ -934,42 +1819,30 @@ def get_stock_news_sentiment(symbol, company_name):
             'sentiment_trend': pd.DataFrame({'date': [], 'sentiment': []})
         }
 
+@st.cache_data(ttl=300, max_entries=32)
+def get_stocks_news_sentiment(symbols):
+    """Get news sentiment for several stocks concurrently.
+
+    Symbols that are not listed in INDIAN_STOCKS are skipped.
+    """
+    company_names = {symbol: name for name, symbol in INDIAN_STOCKS.items()}
+    symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol in company_names]
+    if not symbols:
+        return {}
+
+    # News has no bulk endpoint, so the per-stock requests run on the worker pool
+    return fetch_in_parallel({
+        symbol: partial(get_stock_news_sentiment, symbol, company_names[symbol])
+        for symbol in symbols
+    })
+
 def generate_signals(data):
     """Generate trading signals based on technical indicators."""
     if data.empty:
         return data
     
-    signals = data.copy()
-    
-    # RSI signals
-    signals['RSI_Signal'] = 0
-    signals.loc[signals['RSI'] < 30, 'RSI_Signal'] = 1  # Oversold
-    signals.loc[signals['RSI'] > 70, 'RSI_Signal'] = -1  # Overbought
-    
-    # MACD signals
-    signals['MACD_Signal'] = 0
-    signals.loc[signals['MACD'] > signals['MACD_Signal'], 'MACD_Signal'] = 1
-    signals.loc[signals['MACD'] < signals['MACD_Signal'], 'MACD_Signal'] = -1
-    
-    # Moving Average signals
-    signals['MA_Signal'] = 0
-    signals.loc[signals['SMA_50'] > signals['SMA_200'], 'MA_Signal'] = 1
-    signals.loc[signals['SMA_50'] < signals['SMA_200'], 'MA_Signal'] = -1
-    
-    # Bollinger Bands signals
-    signals['BB_Signal'] = 0
-    signals.loc[signals['Close'] < signals['BB_Lower'], 'BB_Signal'] = 1
-    signals.loc[signals['Close'] > signals['BB_Upper'], 'BB_Signal'] = -1
-    
-    # Overall signal
-    signals['Overall_Signal'] = (
-        signals['RSI_Signal'] +
-        signals['MACD_Signal'] +
-        signals['MA_Signal'] +
-        signals['BB_Signal']
-    ) / 4
-    
-    return signals
+    indicators = {name: data[name].to_numpy() for name in SIGNAL_INPUTS}
+    return data.assign(**calculate_signal_components(data['Close'].to_numpy(), indicators))
 
 def interpret_signal(signal):
     """Interpret the trading signal."""
@@ -1364,8 +2237,7 @@ def show_financial_literacy():
             
             elif "Stock Market" in subtopic:
                 st.subheader("📈 Live Market Overview")
-                nifty_data = get_nifty_data(period='1d')
-                sensex_data = get_sensex_data(period='1d')
+                nifty_data, sensex_data = get_market_indices(period='1d')
                 
                 if not nifty_data.empty and not sensex_data.empty:
                     col1, col2 = st.columns(2)
@@ -1392,6 +2264,299 @@ def show_financial_literacy():
     st.sidebar.progress(completed/total_topics)
     st.sidebar.write(f"Progress: {completed}/{total_topics} topics completed")
 
+# Chart downsampling: long histories are cut to a point budget before plotting,
+# keeping the visual shape of the line (Largest-Triangle-Three-Buckets)
+CHART_POINT_BUDGET = int(os.environ.get("CHART_POINT_BUDGET", "1000"))
+
+def lttb_indices(x, y, budget):
+    """Return the positions of at most `budget` points that preserve the shape of a line.
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previously kept
+    point and the average of the next bucket.
+    """
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (budget - 2)
+    edges = np.floor(np.arange(budget - 1) * every).astype(int) + 1
+    # Average of each bucket; the last point stands in for the bucket after the last one
+    counts = np.diff(edges)
+    x_means = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts, x[-1])
+    y_means = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(budget, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        areas = np.abs(
+            (x[previous] - x_means[bucket + 1]) * (y[start:end] - y[previous]) -
+            (x[previous] - x[start:end]) * (y_means[bucket + 1] - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+def downsample_for_chart(data, column, budget=None):
+    """Return the rows of a frame kept when plotting `column` within the point budget.
+
+    Other columns plotted alongside (moving averages, bands) use the same
+    rows, so every trace shares the x values of the base series.
+    """
+    budget = budget or CHART_POINT_BUDGET
+    if len(data) <= budget:
+        return data
+
+    values = data[column].to_numpy(dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    if isinstance(data.index, pd.DatetimeIndex):
+        x = ((data.index - data.index[0]) / pd.Timedelta(days=1)).to_numpy(dtype=float)
+    else:
+        x = np.arange(len(data), dtype=float)
+    return data.iloc[valid[lttb_indices(x[valid], values[valid], budget)]]
+
+# Compact figures: numeric and date arrays are sent as binary typed arrays
+# (plotly >= 6) instead of JSON lists
+
+def _compact_array(values):
+    """Return an array plotly can send as a typed array: dates as epoch ms, numbers as float32."""
+    if not isinstance(values, np.ndarray):
+        return values, False
+    if values.dtype.kind == 'M':
+        # Float milliseconds: int64 has no typed array in the browser
+        return values.astype('datetime64[ms]').astype(np.int64).astype(np.float64), True
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.float32), False
+    return values, False
+
+def compact_figure(fig):
+    """Return a copy of a figure that is cheaper to send and render."""
+    traces = []
+    date_axis = False
+    for trace in fig.data:
+        properties = trace.to_plotly_json()
+        if trace.type not in ('scatter', 'scattergl', 'bar'):
+            traces.append(trace)
+            continue
+        for axis in ('x', 'y'):
+            if axis in properties:
+                properties[axis], is_date = _compact_array(properties[axis])
+                date_axis = date_axis or (axis == 'x' and is_date)
+        marker = properties.get('marker')
+        if marker and 'color' in marker:
+            marker['color'], _ = _compact_array(marker['color'])
+        trace_type = properties.pop('type')
+        traces.append({'scatter': go.Scatter, 'scattergl': go.Scattergl, 'bar': go.Bar}[trace_type](**properties))
+
+    compact = go.Figure(data=traces, layout=fig.layout)
+    if date_axis:
+        # Epoch milliseconds are only shown as dates on a date axis
+        compact.update_xaxes(type='date')
+    return compact
+
+# Stock analysis charts. Built figures are cached per symbol, period, timeframe,
+# chart and last bar, so repeat views by any session skip the DataFrame work
+# and figure construction (Streamlit still serializes the figure it is given).
+FIGURE_CACHE_BYTES = int(float(os.environ.get("FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+
+def build_price_chart(data, stock_name):
+    """Build the price chart with the 50 and 200 day moving averages."""
+    chart_data = downsample_for_chart(data, 'Close')
+    fig = go.Figure()
+    
+    # Price
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['Close'],
+        name="Price",
+        line=dict(color='blue')
+    ))
+    
+    # Moving Averages
+    if 'SMA_50' in chart_data.columns:
+        fig.add_trace(go.Scatter(
+            x=chart_data.index,
+            y=chart_data['SMA_50'],
+            name="SMA 50",
+            line=dict(color='orange')
+        ))
+    
+    if 'SMA_200' in chart_data.columns:
+        fig.add_trace(go.Scatter(
+            x=chart_data.index,
+            y=chart_data['SMA_200'],
+            name="SMA 200",
+            line=dict(color='red')
+        ))
+    
+    fig.update_layout(
+        title=f"{stock_name} Stock Price with Moving Averages",
+        xaxis_title="Date",
+        yaxis_title="Price (₹)",
+        hovermode='x unified',
+        height=500
+    )
+    return compact_figure(fig)
+
+def build_rsi_chart(data, stock_name):
+    """Build the RSI chart with the overbought and oversold levels."""
+    chart_data = downsample_for_chart(data, 'RSI')
+    fig = go.Figure()
+    
+    # RSI
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['RSI'],
+        name="RSI",
+        line=dict(color='purple')
+    ))
+    
+    # Add overbought and oversold lines
+    fig.add_shape(
+        type="line",
+        x0=data.index[0],
+        y0=70,
+        x1=data.index[-1],
+        y1=70,
+        line=dict(color="red", width=2, dash="dash")
+    )
+    
+    fig.add_shape(
+        type="line",
+        x0=data.index[0],
+        y0=30,
+        x1=data.index[-1],
+        y1=30,
+        line=dict(color="green", width=2, dash="dash")
+    )
+    
+    fig.update_layout(
+        title=f"{stock_name} RSI Indicator",
+        xaxis_title="Date",
+        yaxis_title="RSI",
+        hovermode='x unified',
+        height=400
+    )
+    return compact_figure(fig)
+
+def build_bollinger_chart(data, stock_name):
+    """Build the price chart with Bollinger Bands."""
+    chart_data = downsample_for_chart(data, 'Close')
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['Close'],
+        name="Price",
+        line=dict(color='blue')
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['BB_Upper'],
+        name="Upper Band",
+        line=dict(color='gray', dash='dash')
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['BB_Lower'],
+        name="Lower Band",
+        line=dict(color='gray', dash='dash'),
+        fill='tonexty',
+        fillcolor='rgba(200, 200, 200, 0.2)'
+    ))
+    
+    fig.update_layout(
+        title=f"{stock_name} Price with Bollinger Bands",
+        xaxis_title="Date",
+        yaxis_title="Price (₹)",
+        hovermode='x unified',
+        height=400
+    )
+    return compact_figure(fig)
+
+def build_macd_chart(data, stock_name):
+    """Build the MACD chart with its signal line and histogram."""
+    chart_data = downsample_for_chart(data, 'MACD')
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['MACD'],
+        name="MACD",
+        line=dict(color='blue')
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data['MACD_Signal'],
+        name="Signal",
+        line=dict(color='red')
+    ))
+    
+    # Add histogram for MACD histogram
+    fig.add_trace(go.Bar(
+        x=chart_data.index,
+        y=chart_data['MACD_Histogram'],
+        name="Histogram",
+        marker_color=np.where(chart_data['MACD_Histogram'] > 0, 'green', 'red')
+    ))
+    
+    fig.update_layout(
+        title=f"{stock_name} MACD Indicator",
+        xaxis_title="Date",
+        yaxis_title="MACD",
+        hovermode='x unified',
+        height=300
+    )
+    return compact_figure(fig)
+
+STOCK_CHARTS = {
+    'price': build_price_chart,
+    'rsi': build_rsi_chart,
+    'bollinger': build_bollinger_chart,
+    'macd': build_macd_chart
+}
+
+# Indicator columns drawn by each chart section of the stock analysis page;
+# only these and SIGNAL_INPUTS are calculated for the selected section
+STOCK_CHART_SECTIONS = {
+    "Price & Moving Averages": ['SMA_50', 'SMA_200'],
+    "RSI": ['RSI'],
+    "MACD & Bollinger Bands": ['BB_Upper', 'BB_Lower', 'BB_Middle', 'MACD', 'MACD_Signal', 'MACD_Histogram']
+}
+
+@st.cache_resource
+def get_figure_cache():
+    """Return the cache of built figures shared by all sessions."""
+    return MarketDataCache(max_bytes=FIGURE_CACHE_BYTES)
+
+def get_stock_chart(chart, symbol, stock_name, period, timeframe, data):
+    """Return a stock analysis chart ('price', 'rsi', 'bollinger' or 'macd'), built once per last bar.
+
+    The returned figure is shared between sessions and must not be modified.
+    """
+    key = ('figure', chart, symbol, period, timeframe, data.index[-1], float(data['Close'].iloc[-1]), len(data))
+    cache = get_figure_cache()
+    entry = cache.lookup(key)
+    if entry is not None:
+        return entry['value']
+
+    figure = STOCK_CHARTS[chart](data, stock_name)
+    cache.put(key, figure, expires_at=float('inf'))
+    return figure
+
+def select_section(labels, key):
+    """Show a row of section buttons and return the selected label.
+
+    Unlike st.tabs, which runs every tab body on each rerun, only the
+    selected section is built, so the others fetch and plot nothing.
+    """
+    return st.radio("Section", labels, horizontal=True, key=key, label_visibility="collapsed")
+
 def show_stock_analysis():
     """Display stock analysis page"""
     # Initialize session state for stock analysis if not already done
@@ -1483,14 +2648,39 @@ def show_stock_analysis():
             ["1mo", "3mo", "6mo", "1y", "2y"],
             index=2
         )
+        
+        # Bar size of the indicators and charts
+        timeframe = st.selectbox(
+            "Select Timeframe",
+            list(TIMEFRAMES.keys()),
+            format_func=lambda key: TIMEFRAMES[key][0]
+        )
+    
+    # Fetch index data, price history and company info in parallel
+    with st.spinner(f"Fetching market data for {selected_stock_name}..."):
+        market_data = fetch_in_parallel(
+            {
+                "NIFTY data": get_nifty_data,
+                "SENSEX data": get_sensex_data,
+                "stock data": partial(get_stock_data, selected_symbol, period=_widest_period(period, INDICATOR_HISTORY[timeframe])),
+                "stock information": partial(get_stock_info, selected_symbol)
+            },
+            defaults={
+                "NIFTY data": pd.DataFrame(),
+                "SENSEX data": pd.DataFrame(),
+                "stock data": pd.DataFrame(),
+                "stock information": {}
+            }
+        )
+    nifty_data = market_data["NIFTY data"]
+    sensex_data = market_data["SENSEX data"]
+    stock_history = market_data["stock data"]
+    stock_data = slice_period(stock_history, period)
+    stock_info = market_data["stock information"]
     
     with col2:
         st.markdown("### Stock Market Indices")
         
-        # Fetch index data
-        nifty_data = get_nifty_data()
-        sensex_data = get_sensex_data()
-        
         # Display current index values
         if not nifty_data.empty and not sensex_data.empty:
             nifty_current = nifty_data['Close'].iloc[-1]
@@ -1516,22 +2706,27 @@ def show_stock_analysis():
                     f"₹{sensex_current:.2f}",
                     f"{sensex_change:.2f}%"
                 )
+            
+            index_timestamp = get_data_timestamp("^NSEI")
+            if index_timestamp:
+                st.caption(f"Indices as of {index_timestamp:%d %b %Y, %H:%M}")
     
     # Fetch and process stock data
     with st.spinner(f"Analyzing {selected_stock_name}..."):
-        # Get stock data and info
-        stock_data = get_stock_data(selected_symbol, period=period)
-        stock_info = get_stock_info(selected_symbol)
-        
         if stock_data.empty:
             st.error(f"No data available for {selected_stock_name}")
             st.stop()
         
-        # Calculate indicators
-        data_with_indicators = calculate_all_indicators(stock_data)
+        # Calculate the signal inputs and the indicators of the selected chart
+        # section; the section buttons below set this key before each rerun
+        chart_section = st.session_state.get("stock_chart_section", next(iter(STOCK_CHART_SECTIONS)))
+        indicator_names = list(dict.fromkeys([*SIGNAL_INPUTS, *STOCK_CHART_SECTIONS[chart_section]]))
+        data_with_indicators, signals = analyze_stock(selected_symbol, stock_history, indicator_names, timeframe=timeframe)
+        data_with_indicators = slice_period(data_with_indicators, period)
+        signals = signals.loc[data_with_indicators.index]
         
-        # Generate signals
-        signals = generate_signals(data_with_indicators)
+        # Even the longer history may be too short, e.g. for SMA_200 on monthly bars
+        unavailable = [name for name in indicator_names if data_with_indicators[name].isna().all()]
         
         # Display stock information and price
         st.markdown(f"## {selected_stock_name} ({selected_symbol})")
@@ -1553,6 +2748,10 @@ def show_stock_analysis():
                 f"₹{current_price:.2f}",
                 f"{price_change:.2f}%"
             )
+            
+            price_timestamp = get_data_timestamp(selected_symbol)
+            if price_timestamp:
+                st.caption(f"Prices as of {price_timestamp:%d %b %Y, %H:%M}")
         
         with col2:
             if stock_info:
@@ -1581,6 +2780,10 @@ def show_stock_analysis():
         # Investment Recommendation
         st.subheader("💡 Investment Recommendation")
         
+        if unavailable:
+            st.info(f"Not enough {TIMEFRAMES[timeframe][0].lower()} history to calculate {', '.join(unavailable)}. "
+                    "Missing indicators are left out of the charts and vote neutral in the signal.")
+        
         # Get the latest signal
         if 'Overall_Signal' in signals.columns:
             latest_signal = signals['Overall_Signal'].iloc[-1]
@@ -1640,165 +2843,32 @@ def show_stock_analysis():
         # Display technical indicators
         st.markdown("### Technical Indicators")
         
-        # Create tabs for different visualizations
-        tab1, tab2, tab3 = st.tabs(["Price & Moving Averages", "RSI", "MACD & Bollinger Bands"])
+        # Only the selected chart section is built
+        chart_section = select_section(list(STOCK_CHART_SECTIONS), key="stock_chart_section")
         
-        with tab1:
-            fig = go.Figure()
-            
-            # Price
-            fig.add_trace(go.Scatter(
-                x=data_with_indicators.index,
-                y=data_with_indicators['Close'],
-                name="Price",
-                line=dict(color='blue')
-            ))
-            
-            # Moving Averages
-            if 'SMA_50' in data_with_indicators.columns:
-                fig.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['SMA_50'],
-                    name="SMA 50",
-                    line=dict(color='orange')
-                ))
-            
-            if 'SMA_200' in data_with_indicators.columns:
-                fig.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['SMA_200'],
-                    name="SMA 200",
-                    line=dict(color='red')
-                ))
-            
-            fig.update_layout(
-                title=f"{selected_stock_name} Stock Price with Moving Averages",
-                xaxis_title="Date",
-                yaxis_title="Price (₹)",
-                hovermode='x unified',
-                height=500
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        def show_chart(chart):
+            figure = get_stock_chart(chart, selected_symbol, selected_stock_name, period, timeframe, data_with_indicators)
+            st.plotly_chart(figure, use_container_width=True)
         
-        with tab2:
+        if chart_section == "Price & Moving Averages":
+            show_chart('price')
+        
+        elif chart_section == "RSI":
             if 'RSI' in data_with_indicators.columns:
-                fig = go.Figure()
-                
-                # RSI
-                fig.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['RSI'],
-                    name="RSI",
-                    line=dict(color='purple')
-                ))
-                
-                # Add overbought and oversold lines
-                fig.add_shape(
-                    type="line",
-                    x0=data_with_indicators.index[0],
-                    y0=70,
-                    x1=data_with_indicators.index[-1],
-                    y1=70,
-                    line=dict(color="red", width=2, dash="dash")
-                )
-                
-                fig.add_shape(
-                    type="line",
-                    x0=data_with_indicators.index[0],
-                    y0=30,
-                    x1=data_with_indicators.index[-1],
-                    y1=30,
-                    line=dict(color="green", width=2, dash="dash")
-                )
-                
-                fig.update_layout(
-                    title=f"{selected_stock_name} RSI Indicator",
-                    xaxis_title="Date",
-                    yaxis_title="RSI",
-                    hovermode='x unified',
-                    height=400
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+                show_chart('rsi')
             else:
                 st.info("RSI data not available for the selected timeframe")
         
-        with tab3:
+        else:
             # Price and Bollinger Bands
             if all(col in data_with_indicators.columns for col in ['BB_Upper', 'BB_Lower', 'BB_Middle']):
-                fig = go.Figure()
-                
-                fig.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['Close'],
-                    name="Price",
-                    line=dict(color='blue')
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['BB_Upper'],
-                    name="Upper Band",
-                    line=dict(color='gray', dash='dash')
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['BB_Lower'],
-                    name="Lower Band",
-                    line=dict(color='gray', dash='dash'),
-                    fill='tonexty',
-                    fillcolor='rgba(200, 200, 200, 0.2)'
-                ))
-                
-                fig.update_layout(
-                    title=f"{selected_stock_name} Price with Bollinger Bands",
-                    xaxis_title="Date",
-                    yaxis_title="Price (₹)",
-                    hovermode='x unified',
-                    height=400
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+                show_chart('bollinger')
             else:
                 st.info("Bollinger Bands data not available for the selected timeframe")
             
             # MACD chart
             if all(col in data_with_indicators.columns for col in ['MACD', 'MACD_Signal', 'MACD_Histogram']):
-                fig2 = go.Figure()
-                
-                fig2.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['MACD'],
-                    name="MACD",
-                    line=dict(color='blue')
-                ))
-                
-                fig2.add_trace(go.Scatter(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['MACD_Signal'],
-                    name="Signal",
-                    line=dict(color='red')
-                ))
-                
-                # Add histogram for MACD histogram
-                fig2.add_trace(go.Bar(
-                    x=data_with_indicators.index,
-                    y=data_with_indicators['MACD_Histogram'],
-                    name="Histogram",
-                    marker_color=np.where(data_with_indicators['MACD_Histogram'] > 0, 'green', 'red')
-                ))
-                
-                fig2.update_layout(
-                    title=f"{selected_stock_name} MACD Indicator",
-                    xaxis_title="Date",
-                    yaxis_title="MACD",
-                    hovermode='x unified',
-                    height=300
-                )
-                
-                st.plotly_chart(fig2, use_container_width=True)
+                show_chart('macd')
             else:
                 st.info("MACD data not available for the selected timeframe")
         
@@ -1825,6 +2895,480 @@ def show_stock_analysis():
         save_user_activity('stock_analysis', activity_data)
         st.session_state.last_stock_search = selected_symbol
 
+# Stock screener: signals for a whole list of stocks in one vectorized pass
+SCREENER_CROSSOVER_BARS = 10  # how far back a moving average crossover counts as recent
+
+SCREENER_RANKINGS = {
+    "Overall Signal (strongest buy first)": ('Overall Signal', False),
+    "Overall Signal (strongest sell first)": ('Overall Signal', True),
+    "RSI (most oversold first)": ('RSI', True),
+    "RSI (most overbought first)": ('RSI', False),
+    "Recent MA Crossover": ('Bars Since Crossover', True)
+}
+
+def parse_symbol_list(uploaded_file):
+    """Read stock symbols from an uploaded CSV (with a Symbol column) or text file.
+
+    Raises ValueError for a table without a Symbol column, whose header and
+    other columns would otherwise be read as symbols.
+    """
+    text = uploaded_file.getvalue().decode('utf-8', errors='ignore')
+    try:
+        table = pd.read_csv(StringIO(text))
+    except Exception:
+        table = pd.DataFrame()
+    columns = {str(column).strip().lower(): column for column in table.columns}
+    if 'symbol' in columns:
+        values = table[columns['symbol']].dropna().astype(str)
+        return [normalize_symbol(value.strip().upper()) for value in values if value.strip()]
+    if len(table.columns) > 1 and not table.empty:
+        raise ValueError("The uploaded table has no Symbol column. Add one, or list one symbol per line.")
+    return [normalize_symbol(value.upper()) for value in re.split(r'[\s,;]+', text) if value]
+
+def screen_stocks(symbols, period='1y'):
+    """Compute the latest trading signals of many stocks at once.
+
+    Returns one row per stock with its price, RSI, overall signal,
+    recommendation and most recent moving average crossover.
+    """
+    prices = get_close_prices(symbols, period=period)
+    if prices.empty:
+        return pd.DataFrame()
+
+    # One row per symbol, one column per bar
+    close = close_price_array(prices)
+    indicators = calculate_indicator_matrix(close, SIGNAL_INPUTS)
+    signals = calculate_signal_components(close, indicators)
+
+    # Latest moving average crossover within the lookback window. Both averages
+    # must exist on both bars, or the bar where SMA_200 first appears would count
+    ma_signal = signals['MA_Signal'][:, -SCREENER_CROSSOVER_BARS:]
+    both_defined = ~np.isnan(indicators['SMA_50'] + indicators['SMA_200'])[:, -SCREENER_CROSSOVER_BARS:]
+    crossed = (
+        (ma_signal[:, 1:] != ma_signal[:, :-1]) & (ma_signal[:, 1:] != 0) &
+        both_defined[:, 1:] & both_defined[:, :-1]
+    )
+    last_cross = crossed.shape[1] - 1 - np.argmax(crossed[:, ::-1], axis=1)
+    has_cross = crossed.any(axis=1)
+    cross_direction = np.take_along_axis(ma_signal[:, 1:], last_cross[:, np.newaxis], axis=1)[:, 0]
+
+    company_names = {symbol: name for name, symbol in INDIAN_STOCKS.items()}
+    overall = signals['Overall_Signal'][:, -1]
+    interpretations = [interpret_signal(signal) for signal in overall]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (close[:, -1] / close[:, -2] - 1) * 100 if close.shape[1] > 1 else np.full(len(close), np.nan)
+
+    return pd.DataFrame({
+        'Stock': [company_names.get(symbol, symbol) for symbol in prices.columns],
+        'Symbol': prices.columns,
+        'Price (₹)': close[:, -1],
+        'Change (%)': change,
+        'RSI': indicators['RSI'][:, -1],
+        'Overall Signal': overall,
+        'Recommendation': [recommendation for recommendation, _ in interpretations],
+        'Confidence (%)': [confidence for _, confidence in interpretations],
+        'MA Crossover': np.where(has_cross, np.where(cross_direction > 0, "Golden cross", "Death cross"), ""),
+        'Bars Since Crossover': np.where(has_cross, crossed.shape[1] - 1 - last_cross, np.nan)
+    })
+
+def show_stock_screener():
+    """Display the stock screener page"""
+    st.markdown("<h1 class='main-header'>Stock Screener</h1>", unsafe_allow_html=True)
+    
+    st.write("""
+    Screen the whole stock universe for buy and sell signals, oversold or overbought RSI
+    and recent moving average crossovers.
+    """)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        uploaded_file = st.file_uploader(
+            "Add more stocks (CSV with a Symbol column, or one symbol per line)",
+            type=['csv', 'txt']
+        )
+        include_universe = st.checkbox("Include all listed Indian stocks", value=True)
+    
+    with col2:
+        ranking = st.selectbox("Rank By", list(SCREENER_RANKINGS.keys()))
+        period = st.selectbox("Select Data Period", ["1y", "2y"], index=0)
+    
+    symbols = list(INDIAN_STOCKS.values()) if include_universe else []
+    if uploaded_file is not None:
+        try:
+            symbols.extend(parse_symbol_list(uploaded_file))
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+    symbols = list(dict.fromkeys(symbols))
+    
+    if not symbols:
+        st.warning("Please include the listed stocks or upload a list of symbols to screen.")
+        st.stop()
+    
+    with st.spinner(f"Screening {len(symbols)} stocks..."):
+        started = time.monotonic()
+        results = screen_stocks(symbols, period=period)
+        elapsed = time.monotonic() - started
+    
+    if results.empty:
+        st.error("No price data available for the selected stocks")
+        st.stop()
+    
+    column, ascending = SCREENER_RANKINGS[ranking]
+    results = results.sort_values(column, ascending=ascending, na_position='last').reset_index(drop=True)
+    
+    # Summary of recommendations
+    col1, col2, col3 = st.columns(3)
+    counts = results['Recommendation'].value_counts()
+    col1.metric("BUY", int(counts.get("BUY", 0)))
+    col2.metric("HOLD", int(counts.get("HOLD", 0)))
+    col3.metric("SELL", int(counts.get("SELL", 0)))
+    
+    st.dataframe(results.style.format({
+        'Price (₹)': '{:.2f}',
+        'Change (%)': '{:.2f}',
+        'RSI': '{:.1f}',
+        'Overall Signal': '{:.2f}',
+        'Bars Since Crossover': '{:.0f}'
+    }, na_rep='-'), use_container_width=True)
+    
+    missing = [symbol for symbol in symbols if symbol not in set(results['Symbol'])]
+    if missing:
+        st.caption(f"No price data for: {', '.join(missing)}")
+    st.caption(f"Screened {len(results)} stocks in {elapsed:.2f}s. Click a column header to sort.")
+
+# Backtesting: the signal strategy of signal_engine.backtest_signals on the
+# stored Close prices of several stocks
+BACKTEST_PERIODS = ["1y", "2y", "3y", "5y", "10y"]  # the widest lookbacks of any page
+
+def backtest_stocks(symbols, period='5y', threshold=0.2, slippage=BACKTEST_SLIPPAGE, **params):
+    """Backtest the signal strategy for several stocks.
+
+    Returns (metrics frame with one row per stock, date x symbol equity curves).
+    """
+    prices = get_close_prices(symbols, period=period)
+    if prices.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    close = close_price_array(prices)
+    indicators = calculate_indicator_matrix(close, SIGNAL_INPUTS, **params)
+    overall = calculate_signal_components(close, indicators)['Overall_Signal']
+    results = backtest_signals(close, overall, threshold, slippage)
+
+    company_names = {symbol: name for name, symbol in INDIAN_STOCKS.items()}
+    equity = pd.DataFrame(results.pop('equity').T, index=prices.index, columns=prices.columns)
+    metrics = pd.DataFrame(results)
+    metrics.insert(0, 'Symbol', prices.columns)
+    metrics.insert(0, 'Stock', [company_names.get(symbol, symbol) for symbol in prices.columns])
+    return metrics, equity
+
+def sweep_parameters(symbols, grid, period='5y', slippage=BACKTEST_SLIPPAGE, workers=None):
+    """Backtest every combination of a settings grid over several stocks.
+
+    Returns one row per combination with its mean metrics across stocks,
+    ranked by mean Sharpe ratio.
+    """
+    prices = get_close_prices(symbols, period=period)
+    combinations = sweep_grid(grid)
+    if prices.empty or not combinations:
+        return pd.DataFrame()
+
+    results = run_sweep(close_price_array(prices), combinations, slippage, workers)
+    return pd.DataFrame(results).sort_values('Mean Sharpe', ascending=False, na_position='last').reset_index(drop=True)
+
+def show_strategy_backtest():
+    """Display the strategy backtest page"""
+    st.markdown("<h1 class='main-header'>Strategy Backtest</h1>", unsafe_allow_html=True)
+    
+    st.write("""
+    Check how the BUY/SELL/HOLD recommendations would have performed: buy on a BUY signal,
+    sell on a SELL signal and hold otherwise, after NSE charges (STT, exchange and SEBI fees,
+    stamp duty, GST) and slippage.
+    """)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        selected_sector = st.selectbox("Select Sector", ["All Stocks"] + list(INDIAN_SECTORS.keys()))
+        if selected_sector == "All Stocks":
+            symbols = list(INDIAN_STOCKS.values())
+        else:
+            symbols = INDIAN_SECTORS[selected_sector]
+        period = st.selectbox("Select Data Period", BACKTEST_PERIODS, index=3)
+    
+    with col2:
+        threshold = st.slider("Signal Threshold", 0.0, 0.75, 0.2, 0.05,
+                              help="BUY above this Overall Signal, SELL below its negative")
+        slippage_bps = st.number_input("Slippage per Order (basis points)", 0.0, 100.0, BACKTEST_SLIPPAGE * 10000)
+    
+    with st.spinner(f"Backtesting {len(symbols)} stocks..."):
+        started = time.monotonic()
+        metrics, equity = backtest_stocks(symbols, period=period, threshold=threshold, slippage=slippage_bps / 10000)
+        elapsed = time.monotonic() - started
+    
+    if metrics.empty:
+        st.error("No price data available for the selected stocks")
+        st.stop()
+    
+    # Averages across stocks
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Average CAGR", f"{metrics['CAGR'].mean() * 100:.2f}%",
+                f"{(metrics['CAGR'] - metrics['Buy & Hold CAGR']).mean() * 100:.2f}% vs buy & hold")
+    col2.metric("Average Sharpe", f"{metrics['Sharpe'].mean():.2f}")
+    col3.metric("Average Max Drawdown", f"{metrics['Max Drawdown'].mean() * 100:.2f}%")
+    col4.metric("Average Hit Rate", f"{metrics['Hit Rate'].mean() * 100:.1f}%")
+    
+    st.dataframe(metrics.sort_values('Sharpe', ascending=False).reset_index(drop=True).style.format({
+        'CAGR': '{:.2%}',
+        'Sharpe': '{:.2f}',
+        'Max Drawdown': '{:.2%}',
+        'Hit Rate': '{:.1%}',
+        'Exposure': '{:.1%}',
+        'Buy & Hold CAGR': '{:.2%}'
+    }, na_rep='-'), use_container_width=True)
+    st.caption(f"Backtested {len(metrics)} stocks in {elapsed:.2f}s")
+    
+    # Equity curve of one stock against buy & hold
+    stock_names = dict(zip(metrics['Stock'], metrics['Symbol']))
+    selected_stock = st.selectbox("Equity Curve", list(stock_names.keys()))
+    symbol = stock_names[selected_stock]
+    prices = get_close_prices([symbol], period=period)[symbol].dropna()
+    curves = downsample_for_chart(pd.DataFrame({
+        'Strategy': equity[symbol],
+        'Buy & Hold': prices / prices.iloc[0]
+    }).dropna(), 'Strategy')
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=curves.index,
+        y=curves['Strategy'],
+        name='Strategy',
+        line=dict(color='blue')
+    ))
+    fig.add_trace(go.Scatter(
+        x=curves.index,
+        y=curves['Buy & Hold'],
+        name='Buy & Hold',
+        line=dict(color='gray', dash='dash')
+    ))
+    fig.update_layout(
+        title=f"{selected_stock}: Growth of ₹1",
+        xaxis_title="Date",
+        yaxis_title="Value (₹)",
+        height=500
+    )
+    st.plotly_chart(compact_figure(fig), use_container_width=True)
+    
+    # Parameter sweep
+    st.subheader("🔧 Parameter Sweep")
+    st.write("Backtest every combination of indicator settings on the selected stocks and rank them.")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        grid = {
+            'rsi_periods': st.multiselect("RSI Period", [7, 10, 14, 21], default=[14]),
+            'macd_fast': st.multiselect("MACD Fast Span", [8, 12, 16], default=[12]),
+            'macd_slow': st.multiselect("MACD Slow Span", [21, 26, 30], default=[26])
+        }
+    
+    with col2:
+        grid.update({
+            'bb_window': st.multiselect("Bollinger Window", [15, 20, 25], default=[20]),
+            'bb_std': st.multiselect("Bollinger Width (std)", [1.5, 2, 2.5], default=[2]),
+            'threshold': st.multiselect("Signal Threshold", [0.2, 0.3, 0.5, 0.8], default=[0.2])
+        })
+    
+    grid = {name: values for name, values in grid.items() if values}
+    combinations = len(sweep_grid(grid))
+    
+    if st.button(f"Run Sweep ({combinations} combinations)"):
+        with st.spinner(f"Backtesting {combinations} combinations on {len(symbols)} stocks..."):
+            started = time.monotonic()
+            sweep = sweep_parameters(symbols, grid, period=period, slippage=slippage_bps / 10000)
+            elapsed = time.monotonic() - started
+        
+        if sweep.empty:
+            st.error("No valid combinations to backtest")
+        else:
+            st.dataframe(sweep.style.format({
+                'Mean CAGR': '{:.2%}',
+                'Mean Sharpe': '{:.2f}',
+                'Mean Max Drawdown': '{:.2%}',
+                'Mean Hit Rate': '{:.1%}'
+            }, na_rep='-'), use_container_width=True)
+            st.caption(f"Swept {len(sweep)} combinations in {elapsed:.2f}s")
+
+# Random portfolios for the efficient frontier, simulated in chunks of weight
+# matrices instead of one portfolio at a time
+PORTFOLIO_CHUNK_SIZE = 50000
+
+def simulate_portfolios(mean_returns, cov_matrix, num_portfolios=100000, seed=42, risk_free_rate=0.0):
+    """Simulate random long-only portfolios from annualized mean returns and covariance.
+
+    Returns a frame of each portfolio's Return, Volatility and Sharpe ratio;
+    the weights are only kept one chunk at a time.
+    """
+    mean_returns = np.asarray(mean_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    random_state = np.random.RandomState(seed)
+
+    portfolio_returns = np.empty(num_portfolios)
+    variances = np.empty(num_portfolios)
+    for start in range(0, num_portfolios, PORTFOLIO_CHUNK_SIZE):
+        stop = min(start + PORTFOLIO_CHUNK_SIZE, num_portfolios)
+        chunk = random_state.random_sample((stop - start, len(mean_returns)))
+        chunk /= chunk.sum(axis=1, keepdims=True)
+        portfolio_returns[start:stop] = chunk @ mean_returns
+        # Row-wise w' S w for the whole chunk
+        variances[start:stop] = np.einsum('ij,ij->i', chunk @ cov_matrix, chunk)
+
+    volatility = np.sqrt(variances)
+    return pd.DataFrame({
+        'Return': portfolio_returns,
+        'Volatility': volatility,
+        'Sharpe': (portfolio_returns - risk_free_rate) / volatility
+    })
+
+# Efficient frontier solver: the long-only mean-variance problems are solved
+# exactly, as quadratic programs with SLSQP and the max-return linear program
+# with HiGHS
+FRONTIER_POINTS = 50
+PORTFOLIO_GOALS = ["Maximize Sharpe Ratio", "Maximize Return", "Minimize Volatility"]
+
+def _weight_bounds(bounds):
+    """Split per-asset (min, max) weight bounds into arrays, checking they are feasible"""
+    lower, upper = np.asarray(bounds, dtype=float).reshape(-1, 2).T
+    if np.any(lower < 0) or np.any(lower > upper):
+        raise ValueError("Each stock needs 0% <= min weight <= max weight.")
+    if lower.sum() > 1 + 1e-9 or upper.sum() < 1 - 1e-9:
+        raise ValueError("Min weights must add up to at most 100% and max weights to at least 100%.")
+    return lower, upper
+
+def _feasible_weights(lower, upper):
+    """Fully invested weights within the bounds, used as the solver's starting point"""
+    room = upper - lower
+    if room.sum() == 0:
+        return lower.copy()
+    return lower + room * (1 - lower.sum()) / room.sum()
+
+def _min_variance_weights(cov_matrix, lower, upper, start, constraints=()):
+    """Minimize w'Sw over fully invested weights within the bounds"""
+    constraints = [{'type': 'eq', 'fun': lambda w: w.sum() - 1, 'jac': lambda w: np.ones_like(w)}] + list(constraints)
+    result = minimize(
+        lambda w: w @ cov_matrix @ w, start,
+        jac=lambda w: 2 * cov_matrix @ w,
+        method='SLSQP', bounds=list(zip(lower, upper)), constraints=constraints,
+        options={'ftol': 1e-12, 'maxiter': 500}
+    )
+    if not result.success:
+        raise ValueError(f"Portfolio optimization failed: {result.message}")
+    return np.clip(result.x, lower, upper)
+
+def _max_return_weights(mean_returns, lower, upper):
+    """Maximize expected return over fully invested weights within the bounds"""
+    result = linprog(
+        -mean_returns, A_eq=np.ones((1, len(mean_returns))), b_eq=[1],
+        bounds=list(zip(lower, upper)), method='highs'
+    )
+    if not result.success:
+        raise ValueError(f"Portfolio optimization failed: {result.message}")
+    return result.x
+
+def _max_sharpe_weights(mean_returns, cov_matrix, lower, upper, risk_free_rate):
+    """Maximize the Sharpe ratio over fully invested weights within the bounds.
+
+    When some portfolio beats the risk-free rate this is solved as the convex
+    problem min y'Sy s.t. (mu - rf)'y = 1, sum(y) = k, k*min <= y <= k*max,
+    with w = y / k; otherwise the Sharpe ratio is maximized directly.
+    """
+    excess = mean_returns - risk_free_rate
+    start = _feasible_weights(lower, upper)
+    if excess @ _max_return_weights(mean_returns, lower, upper) <= 0:
+        result = minimize(
+            lambda w: -(excess @ w) / np.sqrt(w @ cov_matrix @ w), start,
+            method='SLSQP', bounds=list(zip(lower, upper)),
+            constraints=[{'type': 'eq', 'fun': lambda w: w.sum() - 1}],
+            options={'ftol': 1e-12, 'maxiter': 500}
+        )
+        if not result.success:
+            raise ValueError(f"Portfolio optimization failed: {result.message}")
+        return np.clip(result.x, lower, upper)
+
+    n = len(mean_returns)
+    scale = max(excess @ start, 1e-6)
+    result = minimize(
+        lambda x: x[:n] @ cov_matrix @ x[:n], np.append(start, 1) / scale,
+        jac=lambda x: np.append(2 * cov_matrix @ x[:n], 0),
+        method='SLSQP', bounds=[(0, None)] * (n + 1),
+        constraints=[
+            {'type': 'eq', 'fun': lambda x: excess @ x[:n] - 1, 'jac': lambda x: np.append(excess, 0)},
+            {'type': 'eq', 'fun': lambda x: x[:n].sum() - x[n], 'jac': lambda x: np.append(np.ones(n), -1)},
+            {'type': 'ineq', 'fun': lambda x: x[:n] - lower * x[n],
+             'jac': lambda x: np.column_stack([np.eye(n), -lower])},
+            {'type': 'ineq', 'fun': lambda x: upper * x[n] - x[:n],
+             'jac': lambda x: np.column_stack([-np.eye(n), upper])}
+        ],
+        options={'ftol': 1e-12, 'maxiter': 500}
+    )
+    if not result.success:
+        raise ValueError(f"Portfolio optimization failed: {result.message}")
+    return np.clip(result.x[:n] / result.x[n], lower, upper)
+
+def portfolio_performance(weights, mean_returns, cov_matrix, risk_free_rate=0.0):
+    """Annualized (return, volatility, Sharpe ratio) of a portfolio"""
+    portfolio_return = float(np.asarray(mean_returns) @ weights)
+    volatility = float(np.sqrt(weights @ np.asarray(cov_matrix) @ weights))
+    return portfolio_return, volatility, (portfolio_return - risk_free_rate) / volatility
+
+def optimize_portfolio(mean_returns, cov_matrix, goal, bounds, risk_free_rate=0.0):
+    """Exact optimal weights for one of PORTFOLIO_GOALS.
+
+    mean_returns and cov_matrix are annualized, bounds holds a (min, max)
+    weight pair per asset. Raises ValueError for infeasible bounds.
+    """
+    mean_returns = np.asarray(mean_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    lower, upper = _weight_bounds(bounds)
+
+    if goal == "Maximize Sharpe Ratio":
+        return _max_sharpe_weights(mean_returns, cov_matrix, lower, upper, risk_free_rate)
+    elif goal == "Maximize Return":
+        return _max_return_weights(mean_returns, lower, upper)
+    elif goal == "Minimize Volatility":
+        return _min_variance_weights(cov_matrix, lower, upper, _feasible_weights(lower, upper))
+    raise ValueError(f"Unknown optimization goal: {goal}")
+
+def efficient_frontier(mean_returns, cov_matrix, bounds, points=FRONTIER_POINTS):
+    """Minimum-volatility portfolios at evenly spaced target returns.
+
+    Returns a frame of Return and Volatility running from the minimum-volatility
+    portfolio to the maximum-return one.
+    """
+    mean_returns = np.asarray(mean_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    lower, upper = _weight_bounds(bounds)
+
+    weights = _min_variance_weights(cov_matrix, lower, upper, _feasible_weights(lower, upper))
+    highest_return = mean_returns @ _max_return_weights(mean_returns, lower, upper)
+
+    frontier = []
+    # Each target starts from the previous solution, which is already close
+    for target in np.linspace(mean_returns @ weights, highest_return, points):
+        target_return = {
+            'type': 'eq',
+            'fun': lambda w, target=target: mean_returns @ w - target,
+            'jac': lambda w: mean_returns
+        }
+        try:
+            weights = _min_variance_weights(cov_matrix, lower, upper, weights, [target_return])
+        except ValueError:
+            continue
+        frontier.append((mean_returns @ weights, np.sqrt(weights @ cov_matrix @ weights)))
+
+    return pd.DataFrame(frontier, columns=['Return', 'Volatility'])
+
 def show_portfolio_optimization():
     """Display portfolio optimization page"""
     st.markdown("<h1 class='main-header'>Portfolio Optimization</h1>", unsafe_allow_html=True)
@@ -1851,14 +3395,26 @@ def show_portfolio_optimization():
         
         selected_symbols = [stock_dict[name] for name in symbols]
         
+        # Per-stock weight limits
+        weight_limits = st.data_editor(
+            pd.DataFrame({'Stock': symbols, 'Min Weight (%)': 0.0, 'Max Weight (%)': 100.0}),
+            column_config={
+                'Min Weight (%)': st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0),
+                'Max Weight (%)': st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0)
+            },
+            disabled=['Stock'],
+            hide_index=True,
+            use_container_width=True
+        )
+        
         # Investment amount
         investment_amount = st.number_input("Investment Amount (₹)", 10000.0, 10000000.0, 100000.0)
         
         # Optimization goal
-        optimization_goal = st.radio(
-            "Optimization Goal",
-            ["Maximize Sharpe Ratio", "Maximize Return", "Minimize Volatility"]
-        )
+        optimization_goal = st.radio("Optimization Goal", PORTFOLIO_GOALS)
+        
+        # Risk-free rate for the Sharpe ratio
+        risk_free_rate = st.number_input("Risk-Free Rate (% per year)", 0.0, 20.0, 0.0, step=0.25) / 100
         
         # Time period
         period = st.selectbox(
@@ -1866,6 +3422,16 @@ def show_portfolio_optimization():
             ["1y", "2y", "3y", "5y"],
             index=0
         )
+        
+        # Resolution of the efficient frontier
+        frontier_points = st.slider("Frontier Points", 10, 100, FRONTIER_POINTS)
+        
+        # Size of the Monte Carlo cloud drawn behind the frontier
+        num_portfolios = st.select_slider(
+            "Simulated Portfolios",
+            options=[5000, 20000, 100000, 250000, 1000000],
+            value=100000
+        )
     
     with col2:
         st.image("https://images.unsplash.com/photo-1594135356513-14291e55162a", width=400)
@@ -1876,68 +3442,58 @@ def show_portfolio_optimization():
     
     if submitted:
         with st.spinner("Optimizing portfolio allocation..."):
-            # Fetch data for all selected symbols
-            data = pd.DataFrame()
-            for i, symbol in enumerate(selected_symbols):
-                stock_data = get_stock_data(symbol, period=period)
-                if not stock_data.empty:
-                    data[symbols[i]] = stock_data['Close']
+            # Fetch Close prices for all selected symbols in one request
+            data = get_close_prices(selected_symbols, period=period)
+            data = data.rename(columns=dict(zip(selected_symbols, symbols)))
             
             if data.empty:
                 st.error("No data found for the selected stocks.")
                 st.stop()
             
+            timestamps = [get_data_timestamp(symbol) for symbol in selected_symbols]
+            timestamps = [timestamp for timestamp in timestamps if timestamp]
+            if timestamps:
+                st.caption(f"Prices as of {min(timestamps):%d %b %Y, %H:%M}")
+            
             # Calculate returns and covariance
             returns = data.pct_change().dropna()
             cov_matrix = returns.cov() * 252  # Annualized
             
-            # Run Monte Carlo simulation
-            np.random.seed(42)
-            num_portfolios = 5000
-            results = np.zeros((num_portfolios, len(symbols) + 3))
+            mean_returns = returns.mean() * 252
             
-            for i in range(num_portfolios):
-                # Generate random weights
-                weights = np.random.random(len(symbols))
-                weights /= np.sum(weights)
-                
-                # Calculate portfolio return and volatility
-                portfolio_return = np.sum(returns.mean() * weights) * 252
-                portfolio_volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-                
-                # Calculate Sharpe ratio (assuming 0 risk-free rate)
-                sharpe_ratio = portfolio_return / portfolio_volatility
-                
-                # Store results
-                results[i, :len(symbols)] = weights
-                results[i, len(symbols)] = portfolio_return
-                results[i, len(symbols) + 1] = portfolio_volatility
-                results[i, len(symbols) + 2] = sharpe_ratio
-            
-            # Convert results to DataFrame
-            columns = symbols + ['Return', 'Volatility', 'Sharpe']
-            portfolios = pd.DataFrame(results, columns=columns)
-            
-            # Find optimal portfolio based on goal
-            if optimization_goal == "Maximize Sharpe Ratio":
-                optimal_idx = portfolios['Sharpe'].idxmax()
-            elif optimization_goal == "Maximize Return":
-                optimal_idx = portfolios['Return'].idxmax()
-            else:  # Minimize Volatility
-                optimal_idx = portfolios['Volatility'].idxmin()
-            
-            optimal_portfolio = portfolios.iloc[optimal_idx]
+            # Stocks without data were dropped from the prices; keep the rest aligned
+            assets = list(data.columns)
+            limits = weight_limits.set_index('Stock').reindex(assets)
+            bounds = limits[['Min Weight (%)', 'Max Weight (%)']].fillna({'Min Weight (%)': 0, 'Max Weight (%)': 100}).to_numpy() / 100
+            
+            # Solve for the optimal portfolio and the efficient frontier
+            try:
+                weights = optimize_portfolio(mean_returns, cov_matrix, optimization_goal, bounds, risk_free_rate)
+                frontier = efficient_frontier(mean_returns, cov_matrix, bounds, frontier_points)
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+            
+            if len(frontier) < frontier_points:
+                st.warning(f"{frontier_points - len(frontier)} of {frontier_points} efficient frontier points could not be solved and are not drawn.")
+            
+            optimal_portfolio = dict(zip(
+                ['Return', 'Volatility', 'Sharpe'],
+                portfolio_performance(weights, mean_returns, cov_matrix, risk_free_rate)
+            ))
+            
+            # Random portfolios, shown as context around the frontier
+            portfolios = simulate_portfolios(mean_returns, cov_matrix, num_portfolios, risk_free_rate=risk_free_rate)
             
             # Display results
             st.subheader("Optimal Portfolio Allocation")
             
-            # Get weights and calculate amounts
-            weights = optimal_portfolio[:len(symbols)]
+            # Calculate amounts
             amounts = weights * investment_amount
             
             # Create allocation dataframe
             allocation_data = []
-            for i, symbol in enumerate(symbols):
+            for i, symbol in enumerate(assets):
                 allocation_data.append({
                     'Stock': symbol,
                     'Weight': f"{weights[i]:.2%}",
@@ -1978,6 +3534,7 @@ def show_portfolio_optimization():
                 y=portfolios['Return'],
                 color=portfolios['Sharpe'],
                 color_continuous_scale='viridis',
+                render_mode='webgl',
                 title="Risk vs Return - Efficient Frontier",
                 labels={
                     'x': 'Annualized Volatility',
@@ -1986,6 +3543,16 @@ def show_portfolio_optimization():
                 }
             )
             
+            fig.add_trace(
+                go.Scatter(
+                    x=frontier['Volatility'],
+                    y=frontier['Return'],
+                    mode='lines',
+                    line=dict(color='black', width=3),
+                    name='Efficient Frontier'
+                )
+            )
+            
             # Highlight the optimal portfolio
             fig.add_trace(
                 go.Scatter(
@@ -2006,11 +3573,11 @@ def show_portfolio_optimization():
             )
             
             fig.update_layout(height=600)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(compact_figure(fig), use_container_width=True)
             
             # Pie chart of allocation
             fig = px.pie(
-                names=symbols,
+                names=assets,
                 values=weights,
                 title="Portfolio Allocation",
                 hole=0.4
@@ -2506,14 +4073,14 @@ def show_sentiment_analysis():
     selected_symbol = None
     selected_stock_name = None
     
-    # Create tabs for different sections
-    tab1, tab2, tab3 = st.tabs(["📰 Market News", "📊 Sentiment Dashboard", "🔍 Stock-Specific Analysis"])
+    # Only the selected section is built and fetches its news
+    section = select_section(["📰 Market News", "📊 Sentiment Dashboard", "🔍 Stock-Specific Analysis"], key="sentiment_section")
     
     # Initialize session state for last sentiment search if not exists
     if 'last_sentiment_search' not in st.session_state:
         st.session_state.last_sentiment_search = None
     
-    with tab1:
+    if section == "📰 Market News":
         st.subheader("Today's Market News")
         
         # Market Overview
@@ -2521,8 +4088,7 @@ def show_sentiment_analysis():
         
         with col1:
             # Fetch NIFTY and SENSEX data
-            nifty_data = get_nifty_data(period='1d')
-            sensex_data = get_sensex_data(period='1d')
+            nifty_data, sensex_data = get_market_indices(period='1d')
             
             if not nifty_data.empty and not sensex_data.empty:
                 nifty_change = ((nifty_data['Close'].iloc[-1] - nifty_data['Close'].iloc[0]) / nifty_data['Close'].iloc[0]) * 100
@@ -2561,21 +4127,18 @@ def show_sentiment_analysis():
         st.markdown(f"### {selected_category}")
         
         # Fetch news for top companies in each sector
+        sector_sentiments = get_stocks_news_sentiment([stock for stocks in INDIAN_SECTORS.values() for stock in stocks[:2]])
         sectors_news = {}
         for sector, stocks in INDIAN_SECTORS.items():
             sector_sentiment = 0
             sector_news = []
             
             for stock in stocks[:2]:  # Get news for top 2 stocks in each sector
-                try:
-                    company_name = [name for name, symbol in INDIAN_STOCKS.items() if symbol == stock][0]
-                    news_data = get_stock_news_sentiment(stock, company_name)
-                    
-                    if news_data and news_data['news_items']:
-                        sector_sentiment += news_data['overall_sentiment']
-                        sector_news.extend(news_data['news_items'])
-                except:
-                    continue
+                news_data = sector_sentiments.get(stock)
+                
+                if news_data and news_data['news_items']:
+                    sector_sentiment += news_data['overall_sentiment']
+                    sector_news.extend(news_data['news_items'])
             
             if sector_news:
                 sectors_news[sector] = {
@@ -2599,9 +4162,12 @@ def show_sentiment_analysis():
                     </div>
                     """, unsafe_allow_html=True)
     
-    with tab2:
+    elif section == "📊 Sentiment Dashboard":
         st.subheader("Market Sentiment Dashboard")
         
+        # Fetch news sentiment for every sector stock
+        sector_sentiments = get_stocks_news_sentiment([stock for stocks in INDIAN_SECTORS.values() for stock in stocks])
+        
         # Overall market sentiment
         market_sentiments = {}
         for sector, stocks in INDIAN_SECTORS.items():
@@ -2609,15 +4175,11 @@ def show_sentiment_analysis():
             count = 0
             
             for stock in stocks:
-                try:
-                    company_name = [name for name, symbol in INDIAN_STOCKS.items() if symbol == stock][0]
-                    sentiment_data = get_stock_news_sentiment(stock, company_name)
-                    
-                    if sentiment_data:
-                        sector_sentiment += sentiment_data['overall_sentiment']
-                        count += 1
-                except:
-                    continue
+                sentiment_data = sector_sentiments.get(stock)
+                
+                if sentiment_data:
+                    sector_sentiment += sentiment_data['overall_sentiment']
+                    count += 1
             
             if count > 0:
                 market_sentiments[sector] = sector_sentiment / count
@@ -2666,7 +4228,7 @@ def show_sentiment_analysis():
             else:
                 st.warning("No significant market sentiment data available for visualization.")
     
-    with tab3:
+    else:
         st.subheader("Stock-Specific Sentiment Analysis")
         
         # Stock selection
@@ -3255,6 +4817,8 @@ def main():
         pages = {
             "Financial Literacy": show_financial_literacy,
             "Stock Analysis": show_stock_analysis,
+            "Stock Screener": show_stock_screener,
+            "Strategy Backtest": show_strategy_backtest,
             "Portfolio Optimization": show_portfolio_optimization,
             "Mutual Fund Analysis": mutual_fund_analysis,  # Add new page
             "SIP Calculator": sip_calculator,  # Add new page
@@ -3272,5 +4836,55 @@ def main():
             st.session_state.user_data = {}
             st.rerun()
 
+# Warm-up job: run `python financial_advisor_pro.py --warm-up` from cron before
+# market open so the first users of the day find every symbol cached
+WARM_UP_PERIOD = _widest_period(*BACKTEST_PERIODS)  # widest period offered by the pages
+
+def warm_up_universe():
+    """Return every symbol the pages can ask for: stocks, sector members and indices."""
+    symbols = list(INDIAN_STOCKS.values())
+    for sector_symbols in INDIAN_SECTORS.values():
+        symbols.extend(sector_symbols)
+    symbols.extend(["^NSEI", "^BSESN"])
+    return list(dict.fromkeys(symbols))
+
+def warm_up_market_data(period=WARM_UP_PERIOD):
+    """Load prices, company information and news for the whole universe.
+
+    Prices go into the local price store in one bulk download; information
+    and news are fetched per symbol on the worker pool and saved as
+    snapshots. Prints how long each step took.
+    """
+    symbols = warm_up_universe()
+    started = time.monotonic()
+    try:
+        update_price_store_batch(symbols, period)
+        print(f"Prices for {len(symbols)} symbols ({period}): {time.monotonic() - started:.2f}s")
+    except Exception as e:
+        print(f"Bulk price download failed: {str(e)}")
+
+    def warm_up_symbol(symbol):
+        symbol_started = time.monotonic()
+        get_stock_info(symbol)
+        if symbol in INDIAN_STOCKS.values():
+            get_stock_news(symbol)
+        return time.monotonic() - symbol_started
+
+    futures = {symbol: submit_fetch(partial(warm_up_symbol, symbol)) for symbol in symbols}
+    for symbol, future in futures.items():
+        try:
+            elapsed, messages = future.result()
+        except Exception as e:
+            print(f"{symbol}: failed ({str(e)})")
+            continue
+        problems = f" ({len(messages)} problems: {messages[-1][1]})" if messages else ""
+        print(f"{symbol}: {elapsed:.2f}s{problems}")
+
+    print(f"Warm-up finished in {time.monotonic() - started:.2f}s")
+    print(f"Cache: {get_market_data_cache().stats()}")
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if "--warm-up" in sys.argv:
+        warm_up_market_data()
+    else:
+        main()
@@ -0,0 +1,595 @@
+"""Vectorized and streaming indicators, signals, backtest and parameter sweep.
+
+Pure NumPy/SciPy, with no Streamlit or TensorFlow imports, so the sweep
+workers and the tests can import it on its own.
+"""
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy.signal import lfilter
+
+# Vectorized indicator engine: computes the indicators of many symbols at once
+# from a 2-D price array (one row per symbol, one column per bar). Results match
+# the pandas indicator functions of the app on gap-free histories.
+def _forward_fill(prices):
+    """Carry the last valid price forward over gaps along the time axis."""
+    valid = ~np.isnan(prices)
+    index = np.where(valid, np.arange(prices.shape[-1]), 0)
+    np.maximum.accumulate(index, axis=-1, out=index)
+    filled = np.take_along_axis(prices, index, axis=-1)
+    # Positions before the first valid price stay NaN
+    return np.where(np.logical_or.accumulate(valid, axis=-1), filled, np.nan)
+
+def _rolling_sum(values, window):
+    """Rolling sum along the time axis; NaN unless the whole window is valid."""
+    missing = np.isnan(values)
+    totals = np.cumsum(np.where(missing, 0.0, values), axis=-1)
+    counts = np.cumsum(missing, axis=-1)
+    sums = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return sums
+    window_sums = totals[..., window - 1:].copy()
+    window_sums[..., 1:] -= totals[..., :-window]
+    window_missing = counts[..., window - 1:].copy()
+    window_missing[..., 1:] -= counts[..., :-window]
+    sums[..., window - 1:] = np.where(window_missing == 0, window_sums, np.nan)
+    return sums
+
+def _rolling_mean(values, window):
+    """Rolling mean along the time axis, like pandas rolling(window).mean()."""
+    return _rolling_sum(values, window) / window
+
+def _rolling_std(values, window):
+    """Rolling sample standard deviation (ddof=1), like pandas rolling(window).std()."""
+    stds = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return stds
+    # Two-pass std over sliding windows; a running sum of squares loses
+    # precision on flat prices
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=-1)
+    stds[..., window - 1:] = windows.std(axis=-1, ddof=1)
+    return stds
+
+def _ema(values, span):
+    """Exponential moving average along the time axis, like pandas ewm(span, adjust=False).
+
+    Each row starts at its first valid value; earlier positions stay NaN.
+    """
+    alpha = 2 / (span + 1)
+    valid = np.logical_or.accumulate(~np.isnan(values), axis=-1)
+    first = np.argmax(valid, axis=-1)[..., np.newaxis]
+    start = np.take_along_axis(values, first, axis=-1)
+    # Leading NaNs are filled with the first value so the filter starts there
+    filled = np.where(valid, values, start)
+    ema, _ = lfilter([alpha], [1, alpha - 1], filled, axis=-1, zi=(1 - alpha) * start)
+    return np.where(valid, ema, np.nan)
+
+# Indicator registry: each indicator declares its inputs (price columns or other
+# indicators) and its parameters with defaults. Only the requested indicators
+# and their dependencies are evaluated, and shared inputs such as EMAs are
+# computed once. New indicators only need a registered function.
+INDICATORS = {}
+
+def register_indicator(name, inputs=('Close',), params=None):
+    """Register a function computing an indicator from its input arrays.
+
+    The function is called with the input arrays in order and the declared
+    parameters as keyword arguments.
+    """
+    def decorator(func):
+        INDICATORS[name] = {'func': func, 'inputs': tuple(inputs), 'params': dict(params or {})}
+        return func
+    return decorator
+
+@register_indicator('RSI', params={'rsi_periods': 14})
+def _rsi_indicator(close, rsi_periods):
+    # Simple averages of gains and losses; the first bar counts as no change
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    listed = ~np.isnan(close)
+    with np.errstate(invalid='ignore'):
+        gain = _rolling_mean(np.where(listed, np.where(delta > 0, delta, 0.0), np.nan), rsi_periods)
+        loss = _rolling_mean(np.where(listed, np.where(delta < 0, -delta, 0.0), np.nan), rsi_periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + gain / loss)
+
+@register_indicator('EMA_Fast', params={'macd_fast': 12})
+def _ema_fast_indicator(close, macd_fast):
+    return _ema(close, macd_fast)
+
+@register_indicator('EMA_Slow', params={'macd_slow': 26})
+def _ema_slow_indicator(close, macd_slow):
+    return _ema(close, macd_slow)
+
+@register_indicator('MACD', inputs=['EMA_Fast', 'EMA_Slow'])
+def _macd_indicator(fast, slow):
+    return fast - slow
+
+@register_indicator('MACD_Signal', inputs=['MACD'], params={'macd_signal': 9})
+def _macd_signal_indicator(macd, macd_signal):
+    return _ema(macd, macd_signal)
+
+@register_indicator('MACD_Histogram', inputs=['MACD', 'MACD_Signal'])
+def _macd_histogram_indicator(macd, signal_line):
+    return macd - signal_line
+
+@register_indicator('BB_Middle', params={'bb_window': 20})
+def _bb_middle_indicator(close, bb_window):
+    return _rolling_mean(close, bb_window)
+
+@register_indicator('BB_Width', params={'bb_window': 20, 'bb_std': 2})
+def _bb_width_indicator(close, bb_window, bb_std):
+    return _rolling_std(close, bb_window) * bb_std
+
+@register_indicator('BB_Upper', inputs=['BB_Middle', 'BB_Width'])
+def _bb_upper_indicator(middle, width):
+    return middle + width
+
+@register_indicator('BB_Lower', inputs=['BB_Middle', 'BB_Width'])
+def _bb_lower_indicator(middle, width):
+    return middle - width
+
+@register_indicator('SMA_50')
+def _sma_50_indicator(close):
+    return _rolling_mean(close, 50)
+
+@register_indicator('SMA_200')
+def _sma_200_indicator(close):
+    return _rolling_mean(close, 200)
+
+# Indicators added to a history by calculate_all_indicators, in column order
+INDICATOR_COLUMNS = ['RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram', 'BB_Middle', 'BB_Upper', 'BB_Lower', 'SMA_50', 'SMA_200']
+
+def evaluate_indicators(columns, names, params=None, memo=None):
+    """Evaluate the named indicators and their dependencies from price arrays.
+
+    columns maps price column names (e.g. 'Close') to arrays. params
+    overrides parameter defaults by name. Results are memoized on the
+    indicator, its parameter values and those of its dependencies; pass the
+    same memo dict to reuse them across calls on the same prices.
+    """
+    params = params or {}
+    memo = {} if memo is None else memo
+
+    def evaluate(name):
+        if name in columns:
+            return name, columns[name]
+        spec = INDICATORS[name]
+        values = {param: params.get(param, default) for param, default in spec['params'].items()}
+        inputs = [evaluate(dependency) for dependency in spec['inputs']]
+        key = (name, tuple(sorted(values.items())), tuple(input_key for input_key, _ in inputs))
+        if key not in memo:
+            memo[key] = spec['func'](*(value for _, value in inputs), **values)
+        return key, memo[key]
+
+    return {name: evaluate(name)[1] for name in names}
+
+def calculate_indicator_matrix(prices, names=INDICATOR_COLUMNS, **params):
+    """Calculate indicators for many symbols at once.
+
+    prices is an array of Close prices with time on the last axis (for
+    example symbols x bars). Returns a dict of arrays of the same shape,
+    keyed by indicator name; params override the registered defaults.
+    """
+    prices = _forward_fill(np.asarray(prices, dtype=float))
+    return evaluate_indicators({'Close': prices}, names, params)
+
+# Indicator columns the trading signals are based on
+SIGNAL_INPUTS = ['RSI', 'MACD', 'SMA_50', 'SMA_200', 'BB_Lower', 'BB_Upper']
+SIGNAL_STEP = 1 / 4  # Overall_Signal is the mean of four votes, so it moves in quarters
+
+def calculate_signal_components(close, indicators):
+    """Calculate the buy (1) / sell (-1) votes of each indicator and their average.
+
+    Works on arrays of any shape, e.g. one history or symbols x bars, and
+    returns a dict of arrays keyed by the generate_signals column names.
+    """
+    def vote(buy, sell):
+        return buy.astype(np.int8) - sell.astype(np.int8)
+
+    with np.errstate(invalid='ignore'):
+        components = {
+            'RSI_Signal': vote(indicators['RSI'] < 30, indicators['RSI'] > 70),
+            # generate_signals always compared MACD against its own vote column
+            # (0, then 1 where MACD > 0), which these masks reproduce
+            'MACD_Signal': vote(indicators['MACD'] >= 1, (indicators['MACD'] < 0) | ((indicators['MACD'] > 0) & (indicators['MACD'] < 1))),
+            'MA_Signal': vote(indicators['SMA_50'] > indicators['SMA_200'], indicators['SMA_50'] < indicators['SMA_200']),
+            'BB_Signal': vote(close < indicators['BB_Lower'], close > indicators['BB_Upper'])
+        }
+    components['Overall_Signal'] = (
+        components['RSI_Signal'] +
+        components['MACD_Signal'] +
+        components['MA_Signal'] +
+        components['BB_Signal']
+    ) / 4
+    return components
+
+# Streaming indicator state: seeded from a history once, then advanced one bar
+# at a time in constant time. Each bar gives the same indicators and votes as
+# calculate_indicator_matrix and calculate_signal_components on the history.
+class RollingWindowState:
+    """Rolling sum of the last `window` values, as the difference of running totals like _rolling_sum."""
+
+    def __init__(self, window):
+        self.window = window
+        self.totals = deque([0.0], maxlen=window + 1)
+
+    def update(self, value):
+        self.totals.append(self.totals[-1] + value)
+
+    @property
+    def mean(self):
+        """Mean of the window, or NaN until it is full."""
+        if len(self.totals) <= self.window:
+            return np.nan
+        return (self.totals[-1] - self.totals[0]) / self.window
+
+class RollingVarianceState:
+    """Rolling sample variance (ddof=1) of the last `window` values.
+
+    Kept as a sum and sum of squares of deviations from an anchor. Once per
+    window the anchor moves to the latest value and both sums are recomputed,
+    so rounding errors never build up. A window of equal values has a
+    deviation of exactly 0, as in _rolling_std.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.anchor = 0.0
+        self.total = 0.0
+        self.squares = 0.0
+        self.updates = 0
+        self.repeats = 0  # how many of the latest values are equal
+
+    def update(self, value):
+        self.repeats = self.repeats + 1 if self.values and value == self.values[-1] else 1
+        if self.updates % self.window == 0:
+            self.values.append(value)
+            self.anchor = value
+            deviations = np.array(self.values) - value
+            self.total, self.squares = deviations.sum(), (deviations ** 2).sum()
+        else:
+            if len(self.values) == self.window:
+                oldest = self.values[0] - self.anchor
+                self.total -= oldest
+                self.squares -= oldest * oldest
+            self.values.append(value)
+            deviation = value - self.anchor
+            self.total += deviation
+            self.squares += deviation * deviation
+        self.updates += 1
+
+    @property
+    def std(self):
+        """Standard deviation of the window, or NaN until it is full."""
+        if len(self.values) < self.window:
+            return np.nan
+        if self.repeats >= self.window:
+            return 0.0
+        variance = (self.squares - self.total ** 2 / self.window) / (self.window - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+class EMAState:
+    """Exponential moving average like _ema, started at the first value."""
+
+    def __init__(self, span):
+        self.alpha = 2 / (span + 1)
+        self.value = np.nan
+
+    def update(self, value):
+        if np.isnan(self.value):
+            self.value = value
+        else:
+            self.value = self.alpha * value + (1 - self.alpha) * self.value
+        return self.value
+
+class IndicatorState:
+    """Indicators and signal votes of one symbol, advanced one bar at a time.
+
+    Takes the parameters of the indicator registry (rsi_periods, macd_fast,
+    macd_slow, macd_signal, bb_window, bb_std). A NaN close repeats the last
+    valid one, like the forward fill of calculate_indicator_matrix; bars
+    before the first valid close give NaN indicators and neutral votes.
+    """
+
+    def __init__(self, **params):
+        params = {
+            name: params.get(name, default)
+            for spec in INDICATORS.values()
+            for name, default in spec['params'].items()
+        }
+        self.gains = RollingWindowState(params['rsi_periods'])
+        self.losses = RollingWindowState(params['rsi_periods'])
+        self.ema_fast = EMAState(params['macd_fast'])
+        self.ema_slow = EMAState(params['macd_slow'])
+        self.signal_line = EMAState(params['macd_signal'])
+        self.bb_middle = RollingWindowState(params['bb_window'])
+        self.bb_variance = RollingVarianceState(params['bb_window'])
+        self.bb_std = params['bb_std']
+        self.sma_50 = RollingWindowState(50)
+        self.sma_200 = RollingWindowState(200)
+        self.close = np.nan
+
+    @classmethod
+    def seed(cls, close, **params):
+        """Build the state from an array of Close prices, consuming every bar once."""
+        state = cls(**params)
+        for value in close:
+            state.update(value)
+        return state
+
+    def update(self, close):
+        """Advance by one bar.
+
+        Returns (indicator values keyed by INDICATOR_COLUMNS, signal votes and
+        Overall_Signal keyed like calculate_signal_components).
+        """
+        close = float(close)
+        if np.isnan(close):
+            close = self.close
+        if np.isnan(close):
+            indicators = dict.fromkeys(INDICATOR_COLUMNS, np.nan)
+        else:
+            indicators = self._advance(close)
+        signals = calculate_signal_components(np.float64(close), {name: np.float64(value) for name, value in indicators.items()})
+        return indicators, {name: value.item() for name, value in signals.items()}
+
+    def _advance(self, close):
+        # The first bar counts as no change, like _rsi_indicator
+        delta = 0.0 if np.isnan(self.close) else close - self.close
+        self.close = close
+        self.gains.update(max(delta, 0.0))
+        self.losses.update(max(-delta, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - 100 / (1 + np.float64(self.gains.mean) / self.losses.mean)
+
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        signal_line = self.signal_line.update(macd)
+
+        self.bb_middle.update(close)
+        self.bb_variance.update(close)
+        middle = self.bb_middle.mean
+        width = self.bb_variance.std * self.bb_std
+
+        self.sma_50.update(close)
+        self.sma_200.update(close)
+        return {
+            'RSI': float(rsi),
+            'MACD': macd,
+            'MACD_Signal': signal_line,
+            'MACD_Histogram': macd - signal_line,
+            'BB_Middle': middle,
+            'BB_Upper': middle + width,
+            'BB_Lower': middle - width,
+            'SMA_50': self.sma_50.mean,
+            'SMA_200': self.sma_200.mean
+        }
+
+# Backtesting: replays the BUY/SELL/HOLD rules of interpret_signal as a long-only
+# strategy, vectorized over symbols x bars. A BUY opens a position, a SELL closes
+# it and HOLD keeps the current one; orders fill at the close of the next bar.
+TRADING_DAYS_PER_YEAR = 252
+
+# NSE delivery trade costs as fractions of the traded value
+NSE_STT_RATE = 0.001  # securities transaction tax, on buys and sells
+NSE_TRANSACTION_CHARGE_RATE = 0.0000297  # exchange transaction charges
+SEBI_FEE_RATE = 0.000001
+STAMP_DUTY_RATE = 0.00015  # buys only
+GST_RATE = 0.18  # on transaction charges and SEBI fees
+BACKTEST_SLIPPAGE = 0.0005  # assumed price impact per order
+
+def nse_trade_costs(slippage=BACKTEST_SLIPPAGE):
+    """Return the (buy, sell) cost of a delivery trade as a fraction of its value."""
+    charges = (NSE_TRANSACTION_CHARGE_RATE + SEBI_FEE_RATE) * (1 + GST_RATE)
+    sell_cost = NSE_STT_RATE + charges + slippage
+    return sell_cost + STAMP_DUTY_RATE, sell_cost
+
+def signals_to_positions(overall, threshold=0.2):
+    """Turn Overall_Signal values into long (1) / flat (0) positions held per bar.
+
+    The position decided at a bar's close is executed at the next close.
+    """
+    overall = np.atleast_2d(overall)
+    with np.errstate(invalid='ignore'):
+        target = np.where(overall > threshold, 1.0, np.where(overall < -threshold, 0.0, np.nan))
+    # HOLD keeps the last BUY/SELL decision; nothing is held before the first BUY
+    target = np.nan_to_num(_forward_fill(target), nan=0.0)
+    positions = np.zeros_like(target)
+    positions[:, 1:] = target[:, :-1]
+    return positions
+
+def backtest_signals(close, overall, threshold=0.2, slippage=BACKTEST_SLIPPAGE, risk_free_rate=0.0):
+    """Backtest the long-only signal strategy on Close prices (symbols x bars).
+
+    Returns a dict with per-symbol metrics (CAGR, Sharpe, max drawdown, hit
+    rate, trades, exposure, buy & hold CAGR) and the equity curves.
+    """
+    close = np.atleast_2d(_forward_fill(np.asarray(close, dtype=float)))
+    positions = signals_to_positions(overall, threshold)
+    buy_cost, sell_cost = nse_trade_costs(slippage)
+
+    returns = np.full_like(close, np.nan)
+    returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1
+    listed = ~np.isnan(returns)
+    returns = np.where(listed, returns, 0.0)
+
+    # Returns earned on the position held from the previous bar, less trading costs
+    held = np.zeros_like(positions)
+    held[:, 1:] = positions[:, :-1]
+    changes = positions - held
+    costs = np.maximum(changes, 0) * buy_cost + np.maximum(-changes, 0) * sell_cost
+    strategy_returns = held * returns - costs
+    log_equity = np.cumsum(np.log1p(strategy_returns), axis=1)
+    equity = np.exp(log_equity)
+
+    bars = np.maximum(listed.sum(axis=1), 1)
+    years = bars / TRADING_DAYS_PER_YEAR
+    cagr = equity[:, -1] ** (1 / years) - 1
+    buy_hold = np.exp(np.cumsum(np.log1p(returns), axis=1))[:, -1] ** (1 / years) - 1
+
+    excess = np.where(listed, strategy_returns - risk_free_rate / TRADING_DAYS_PER_YEAR, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.nanmean(excess, axis=1) / np.nanstd(excess, axis=1, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+    max_drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1)
+
+    # Per-trade returns: equity at the exit bar over equity before the entry bar.
+    # Entries and exits alternate within a row, so sorted flat indices pair up;
+    # trades still open are valued at the last bar.
+    n_symbols, n_bars = positions.shape
+    entries = np.flatnonzero(changes > 0)
+    exits = np.concatenate([np.flatnonzero(changes < 0), np.flatnonzero(positions[:, -1] > 0) * n_bars + n_bars - 1])
+    exits.sort()
+    padded = np.concatenate([np.zeros((n_symbols, 1)), log_equity], axis=1)
+    rows = entries // n_bars
+    trade_returns = np.exp(log_equity.ravel()[exits] - padded[rows, entries % n_bars]) - 1
+    trades = np.bincount(rows, minlength=n_symbols)
+    wins = np.bincount(rows, weights=trade_returns > 0, minlength=n_symbols)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.where(trades > 0, wins / trades, np.nan)
+
+    return {
+        'CAGR': cagr,
+        'Sharpe': sharpe,
+        'Max Drawdown': max_drawdown,
+        'Hit Rate': hit_rate,
+        'Trades': trades,
+        'Exposure': (held * listed).sum(axis=1) / bars,
+        'Buy & Hold CAGR': buy_hold,
+        'equity': equity
+    }
+
+# Parameter sweep: evaluates a grid of indicator settings over the same prices on
+# a process pool. The prices are placed in shared memory once per sweep and read
+# by every worker without copying. Workers come from a fork server (or are
+# spawned where there is none), so they never inherit the locks or threads of
+# the app.
+# Only settings the signals read are swept: the MACD vote never looks at the
+# signal line.
+SWEEP_DEFAULTS = {
+    'rsi_periods': 14,
+    'macd_fast': 12,
+    'macd_slow': 26,
+    'bb_window': 20,
+    'bb_std': 2,
+    'threshold': 0.2
+}
+
+_sweep_state = {}
+_sweep_pools = {}  # process pools by number of workers, started on first use
+_sweep_pools_lock = threading.Lock()
+
+def _attach_shared_prices(shared_name, shape, slippage):
+    """Point the worker at the shared prices of a sweep, with a fresh memo of indicators."""
+    prices = (shared_name, shape, slippage)
+    if _sweep_state.get('prices') == prices:
+        return
+    previous = _sweep_state.get('shared')
+    _sweep_state.clear()
+    if previous is not None:
+        previous.close()
+    shared = shared_memory.SharedMemory(name=shared_name)
+    close = np.ndarray(shape, dtype=float, buffer=shared.buf)
+    close.flags.writeable = False
+    _sweep_state.update(prices=prices, shared=shared, close=close, slippage=slippage, memo={})
+
+def _evaluate_shared(prices, settings):
+    """Backtest one combination of settings on the shared prices of a sweep."""
+    _attach_shared_prices(*prices)
+    return _evaluate_settings(settings)
+
+def _evaluate_settings(settings):
+    """Backtest one combination of settings on the worker's prices."""
+    close = _sweep_state['close']
+    params = dict(settings)
+    threshold = params.pop('threshold')
+    indicators = evaluate_indicators({'Close': close}, SIGNAL_INPUTS, params, _sweep_state['memo'])
+    overall = calculate_signal_components(close, indicators)['Overall_Signal']
+    results = backtest_signals(close, overall, threshold, _sweep_state['slippage'])
+    return dict(
+        settings,
+        **{
+            'Mean CAGR': np.nanmean(results['CAGR']),
+            'Mean Sharpe': np.nanmean(results['Sharpe']),
+            'Mean Max Drawdown': np.nanmean(results['Max Drawdown']),
+            'Mean Hit Rate': np.nanmean(results['Hit Rate']) if np.any(results['Trades']) else np.nan,
+            'Trades': int(results['Trades'].sum())
+        }
+    )
+
+def sweep_grid(grid):
+    """Expand a dict of setting -> list of values into valid combinations.
+
+    Unlisted settings keep their defaults. The first settings vary slowest,
+    so neighbouring combinations share most indicators. Thresholds within
+    the same SIGNAL_STEP trade identically, so only the first is kept.
+    """
+    grid = {name: list(dict.fromkeys(grid.get(name, [default]))) for name, default in SWEEP_DEFAULTS.items()}
+    steps = {}
+    for threshold in grid['threshold']:
+        steps.setdefault(np.floor(threshold / SIGNAL_STEP), threshold)
+    grid['threshold'] = list(steps.values())
+    combinations = [dict(zip(grid.keys(), values)) for values in itertools.product(*grid.values())]
+    return [settings for settings in combinations if settings['macd_fast'] < settings['macd_slow']]
+
+def sweep_context():
+    """Return the multiprocessing context the sweep workers are started with."""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+def _sweep_pool(workers):
+    """Return the process pool with this many workers, starting it on first use.
+
+    Started workers also import the main script (without running it, as
+    __mp_main__), so the pool is kept for later sweeps instead of paying
+    that again on each one.
+    """
+    with _sweep_pools_lock:
+        if workers not in _sweep_pools:
+            _sweep_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=sweep_context())
+        return _sweep_pools[workers]
+
+def run_sweep(close, combinations, slippage=BACKTEST_SLIPPAGE, workers=None):
+    """Backtest each combination of settings on Close prices (symbols x bars).
+
+    Returns one dict of settings and mean metrics per combination, in order.
+    With one worker, or when the pool cannot be used, the combinations are
+    evaluated in this process.
+    """
+    close = np.ascontiguousarray(close, dtype=float)
+    workers = workers or min(os.cpu_count() or 1, len(combinations))
+    if workers > 1 and len(combinations) > 1:
+        chunksize = max(1, len(combinations) // (workers * 4))
+        shared = shared_memory.SharedMemory(create=True, size=max(close.nbytes, 1))
+        try:
+            np.ndarray(close.shape, dtype=float, buffer=shared.buf)[...] = close
+            prices = (shared.name, close.shape, slippage)
+            pool = _sweep_pool(workers)
+            try:
+                return list(pool.map(_evaluate_shared, itertools.repeat(prices, len(combinations)), combinations,
+                                     chunksize=chunksize))
+            except BrokenProcessPool:
+                # A worker died; the next sweep starts a new pool
+                with _sweep_pools_lock:
+                    if _sweep_pools.get(workers) is pool:
+                        del _sweep_pools[workers]
+        except OSError:
+            pass
+        finally:
+            shared.close()
+            shared.unlink()
+
+    _sweep_state.update(close=close, slippage=slippage, memo={})
+    try:
+        return [_evaluate_settings(settings) for settings in combinations]
+    finally:
+        _sweep_state.clear()
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def close_history():
+    """Three years of daily Close prices: a random walk with a flat stretch and a gap."""
+    rng = np.random.default_rng(7)
+    close = 500 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, 750)))
+    close[300:330] = close[300]
+    close[400] = np.nan
+    dates = pd.bdate_range("2022-01-03", periods=len(close), name="Date")
+    return pd.DataFrame({'Close': close}, index=dates)
+
+
+@pytest.fixture
+def close_matrix():
+    """Close prices of five stocks (symbols x bars), two of them listed late."""
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, (5, 600)), axis=1))
+    close[1, :250] = np.nan
+    close[3, :40] = np.nan
+    return close
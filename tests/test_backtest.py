@@ -0,0 +1,80 @@
+"""Reference checks for the vectorized backtest and the parameter sweep."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import signal_engine as engine
+
+
+# Backtest
+def reference_backtest(close, overall, threshold, slippage):
+    """Walk one symbol bar by bar: decide at a close, trade at the next close."""
+    buy_cost, sell_cost = engine.nse_trade_costs(slippage)
+    close = pd.Series(close).ffill().to_numpy()
+    equity, held, decided = 1.0, 0.0, 0.0
+    curve, strategy_returns, returns = [], [], []
+    exposure, entry_equity, trades = 0.0, None, []
+    for t in range(len(close)):
+        listed = t > 0 and not np.isnan(close[t - 1])
+        bar_return = close[t] / close[t - 1] - 1 if listed else 0.0
+        position = decided
+        cost = buy_cost if position > held else sell_cost if position < held else 0.0
+        if position > held:
+            entry_equity = equity
+        strategy_return = held * bar_return - cost
+        equity *= 1 + strategy_return
+        if position < held:
+            trades.append(equity / entry_equity - 1)
+        if listed:
+            strategy_returns.append(strategy_return)
+            returns.append(bar_return)
+            exposure += held
+        curve.append(equity)
+        held = position
+        if overall[t] > threshold:
+            decided = 1.0
+        elif overall[t] < -threshold:
+            decided = 0.0
+    if held > 0:
+        trades.append(equity / entry_equity - 1)
+
+    years = max(len(returns), 1) / engine.TRADING_DAYS_PER_YEAR
+    curve = np.array(curve)
+    strategy_returns = np.array(strategy_returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = strategy_returns.mean() / strategy_returns.std(ddof=1) * np.sqrt(engine.TRADING_DAYS_PER_YEAR)
+    return {
+        'CAGR': equity ** (1 / years) - 1,
+        'Sharpe': sharpe,
+        'Max Drawdown': (curve / np.maximum.accumulate(curve) - 1).min(),
+        'Hit Rate': np.mean(np.array(trades) > 0) if trades else np.nan,
+        'Trades': len(trades),
+        'Exposure': exposure / max(len(returns), 1),
+        'Buy & Hold CAGR': np.prod(1 + np.array(returns)) ** (1 / years) - 1,
+        'equity': curve
+    }
+
+
+@pytest.mark.parametrize('threshold', [0.2, 0.3, 0.6])
+def test_backtest_matches_bar_by_bar_loop(close_matrix, threshold):
+    indicators = engine.calculate_indicator_matrix(close_matrix, engine.SIGNAL_INPUTS)
+    overall = engine.calculate_signal_components(engine._forward_fill(close_matrix), indicators)['Overall_Signal']
+    results = engine.backtest_signals(close_matrix, overall, threshold)
+    for row in range(len(close_matrix)):
+        expected = reference_backtest(close_matrix[row], overall[row], threshold, engine.BACKTEST_SLIPPAGE)
+        for metric, value in expected.items():
+            np.testing.assert_allclose(results[metric][row], value, rtol=1e-9, atol=1e-12, err_msg=f"{metric} of row {row}")
+
+
+# Parameter sweep
+def test_sweep_pool_matches_in_process(close_matrix):
+    grid = {'rsi_periods': [10, 14], 'bb_window': [15, 20], 'threshold': [0.1, 0.2, 0.3]}
+    combinations = engine.sweep_grid(grid)
+    assert len(combinations) == 8  # 0.1 and 0.2 fall in the same signal step
+
+    pooled = engine.run_sweep(close_matrix, combinations, workers=2)
+    # A second sweep on other prices reuses the pool's workers
+    shifted = engine.run_sweep(close_matrix[:, 100:], combinations, workers=2)
+    assert 2 in engine._sweep_pools  # the pool ran them, not the in-process fallback
+    assert pd.DataFrame(pooled).equals(pd.DataFrame(engine.run_sweep(close_matrix, combinations, workers=1)))
+    assert pd.DataFrame(shifted).equals(pd.DataFrame(engine.run_sweep(close_matrix[:, 100:], combinations, workers=1)))
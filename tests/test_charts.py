@@ -0,0 +1,40 @@
+"""Reference checks for chart downsampling."""
+import numpy as np
+import pytest
+
+import financial_advisor_pro as fap
+
+
+# Chart downsampling
+def reference_lttb(x, y, budget):
+    """Largest-Triangle-Three-Buckets, one bucket at a time."""
+    n = len(y)
+    every = (n - 2) / (budget - 2)
+    selected = [0]
+    previous = 0
+    for bucket in range(budget - 2):
+        start = int(np.floor(bucket * every)) + 1
+        end = int(np.floor((bucket + 1) * every)) + 1
+        next_start = end
+        next_end = min(int(np.floor((bucket + 2) * every)) + 1, n)
+        if bucket == budget - 3:
+            x_mean, y_mean = x[-1], y[-1]
+        else:
+            x_mean, y_mean = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((x[previous] - x_mean) * (y[i] - y[previous]) - (x[previous] - x[i]) * (y_mean - y[previous]))
+            if area > best_area:
+                best, best_area = i, area
+        selected.append(best)
+        previous = best
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+@pytest.mark.parametrize('n, budget', [(1000, 100), (1237, 400), (5000, 3)])
+def test_lttb_matches_reference(n, budget):
+    rng = np.random.default_rng(n)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = np.cumsum(rng.normal(0, 1, n))
+    np.testing.assert_array_equal(fap.lttb_indices(x, y, budget), reference_lttb(x, y, budget))
@@ -0,0 +1,108 @@
+"""Reference checks for the vectorized indicator engine and the signals built on it."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import financial_advisor_pro as fap
+import signal_engine as engine
+
+
+# Indicator engine
+def reference_indicators(data):
+    """calculate_all_indicators as it was written with pandas rolling/ewm."""
+    data = data.ffill()
+    result = data.copy()
+    result['RSI'] = fap.calculate_rsi(data)
+    for frame in (fap.calculate_macd(data), fap.calculate_bollinger_bands(data)):
+        for column in frame.columns:
+            result[column] = frame[column]
+    result['SMA_50'] = data['Close'].rolling(window=50).mean()
+    result['SMA_200'] = data['Close'].rolling(window=200).mean()
+    return result
+
+
+def test_indicators_match_pandas(close_history):
+    expected = reference_indicators(close_history)
+    actual = fap.calculate_all_indicators(close_history)
+    for column in engine.INDICATOR_COLUMNS:
+        # pandas' running rolling variance leaves ~1e-8 of noise on the flat stretch
+        rtol = 1e-7 if column in ('BB_Upper', 'BB_Lower') else 1e-9
+        np.testing.assert_allclose(actual[column], expected[column], rtol=rtol, atol=1e-9, err_msg=column)
+
+
+def test_bands_close_on_flat_prices(close_history):
+    actual = fap.calculate_all_indicators(close_history)
+    flat = slice(320, 330)  # whole 20-bar window inside the flat stretch
+    np.testing.assert_array_equal(actual['BB_Upper'].iloc[flat], actual['BB_Middle'].iloc[flat])
+    np.testing.assert_array_equal(actual['BB_Lower'].iloc[flat], actual['BB_Middle'].iloc[flat])
+
+
+def test_indicator_matrix_matches_each_symbol(close_matrix):
+    matrix = engine.calculate_indicator_matrix(close_matrix)
+    for row, close in enumerate(close_matrix):
+        listed = ~np.isnan(close)
+        expected = reference_indicators(pd.DataFrame({'Close': close[listed]}))
+        for column in engine.INDICATOR_COLUMNS:
+            assert np.isnan(matrix[column][row, ~listed]).all()
+            np.testing.assert_allclose(matrix[column][row, listed], expected[column], rtol=1e-9, atol=1e-9,
+                                       err_msg=f"{column} of row {row}")
+
+
+def test_indicator_parameters_match_pandas(close_history):
+    data = close_history.ffill()
+    actual = engine.calculate_indicator_matrix(
+        data['Close'].to_numpy(), ['RSI', 'MACD_Signal', 'BB_Upper'],
+        rsi_periods=10, macd_fast=8, macd_slow=21, macd_signal=5, bb_window=15, bb_std=2.5
+    )
+    np.testing.assert_allclose(actual['RSI'], fap.calculate_rsi(data, 10), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(actual['MACD_Signal'], fap.calculate_macd(data, 8, 21, 5)['MACD_Signal'], rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(actual['BB_Upper'], fap.calculate_bollinger_bands(data, 15, 2.5)['BB_Upper'], rtol=1e-9, atol=1e-9)
+
+
+# Fused signals
+def reference_signals(signals):
+    """generate_signals as it was written with column assignments."""
+    signals = signals.copy()
+    signals['RSI_Signal'] = 0
+    signals.loc[signals['RSI'] < 30, 'RSI_Signal'] = 1
+    signals.loc[signals['RSI'] > 70, 'RSI_Signal'] = -1
+    # The original compared MACD against its own, half-written vote column
+    signals['MACD_Signal'] = 0
+    signals.loc[signals['MACD'] > signals['MACD_Signal'], 'MACD_Signal'] = 1
+    signals.loc[signals['MACD'] < signals['MACD_Signal'], 'MACD_Signal'] = -1
+    signals['MA_Signal'] = 0
+    signals.loc[signals['SMA_50'] > signals['SMA_200'], 'MA_Signal'] = 1
+    signals.loc[signals['SMA_50'] < signals['SMA_200'], 'MA_Signal'] = -1
+    signals['BB_Signal'] = 0
+    signals.loc[signals['Close'] < signals['BB_Lower'], 'BB_Signal'] = 1
+    signals.loc[signals['Close'] > signals['BB_Upper'], 'BB_Signal'] = -1
+    signals['Overall_Signal'] = (signals['RSI_Signal'] + signals['MACD_Signal'] + signals['MA_Signal'] + signals['BB_Signal']) / 4
+    return signals
+
+
+def test_signals_match_reference(close_history):
+    # Scale prices so MACD crosses 0 and 1, which the original vote treats differently
+    data = fap.calculate_all_indicators(close_history.ffill() / 20)
+    expected = reference_signals(data)
+    actual = fap.generate_signals(data)
+    for column in ['RSI_Signal', 'MACD_Signal', 'MA_Signal', 'BB_Signal', 'Overall_Signal']:
+        np.testing.assert_array_equal(actual[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float), err_msg=column)
+
+
+# Streaming indicator state
+@pytest.mark.parametrize('params', [{}, {'rsi_periods': 10, 'macd_fast': 8, 'macd_slow': 21, 'macd_signal': 5, 'bb_window': 15, 'bb_std': 2.5}])
+@pytest.mark.parametrize('advance', [1, 460])
+def test_streaming_state_matches_full_history(close_history, params, advance):
+    close_history.iloc[:5] = np.nan  # not listed yet
+    expected, expected_signals = fap.analyze_indicators(close_history, **params)
+    close = close_history['Close'].to_numpy()
+
+    # Seed from all but the last bars, then advance through the flat stretch and the gap
+    state = engine.IndicatorState.seed(close[:-advance], **params)
+    for bar in range(len(close) - advance, len(close)):
+        indicators, signals = state.update(close[bar])
+        for column in engine.INDICATOR_COLUMNS:
+            np.testing.assert_allclose(indicators[column], expected[column].iloc[bar], rtol=1e-7, atol=1e-9,
+                                       err_msg=f"{column} at bar {bar}")
+        for column in expected_signals.columns:
+            assert signals[column] == expected_signals[column].iloc[bar], f"{column} at bar {bar}"
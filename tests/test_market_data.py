@@ -0,0 +1,289 @@
+"""Offline checks for the market data layer, served by the replay provider."""
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import financial_advisor_pro as fap
+
+
+class RecordingProvider(fap.ReplayProvider):
+    """Replay provider that records every history request."""
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(directory, **kwargs)
+        self.requests = []
+
+    def history(self, symbol, period=None, start=None):
+        self.requests.append((symbol, period, start))
+        return super().history(symbol, period=period, start=start)
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    """A replay provider with synthetic prices and its price store in a temporary directory."""
+    provider = RecordingProvider(str(tmp_path))
+    monkeypatch.setattr(fap, 'get_market_data_provider', lambda: provider)
+    return provider
+
+
+# Local price store
+def test_store_downloads_only_new_bars(provider, monkeypatch):
+    monkeypatch.setattr(fap, '_store_is_current', lambda symbol: False)
+    full = fap.update_price_store('TEST.NS', '1y')
+    assert provider.requests == [('TEST.NS', '1y', None)]
+
+    # A store saved five bars ago: only the bars from the last two stored ones are fetched
+    fap.save_price_store('TEST.NS', full.iloc[:-5])
+    updated = fap.update_price_store('TEST.NS', '1y')
+    assert provider.requests[-1] == ('TEST.NS', None, full.index[-7].strftime('%Y-%m-%d'))
+    pd.testing.assert_frame_equal(updated, full, check_freq=False)
+    pd.testing.assert_frame_equal(fap.load_price_store('TEST.NS'), full, check_freq=False)
+
+    # A store saved after the last session settled needs no request at all
+    monkeypatch.setattr(fap, '_store_is_current', lambda symbol: True)
+    pd.testing.assert_frame_equal(fap.update_price_store('TEST.NS', '6mo'), full, check_freq=False)
+    assert len(provider.requests) == 2
+
+
+def test_readjusted_history_is_downloaded_again(provider, monkeypatch):
+    monkeypatch.setattr(fap, '_store_is_current', lambda symbol: False)
+    full = fap.update_price_store('TEST.NS', '1y')
+
+    # Prices stored before a 1:2 split was applied to the whole history
+    unadjusted = full.iloc[:-5].copy()
+    unadjusted[['Open', 'High', 'Low', 'Close']] *= 2
+    fap.save_price_store('TEST.NS', unadjusted)
+
+    updated = fap.update_price_store('TEST.NS', '1y')
+    assert provider.requests[-1] == ('TEST.NS', '1y', None)
+    pd.testing.assert_frame_equal(updated, full, check_freq=False)
+
+
+# Stale-while-revalidate
+def wait_for(condition, timeout=5.0):
+    """Poll condition until it holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_stale_history_is_served_while_refreshed(provider, monkeypatch):
+    cache = fap.MarketDataCache()
+    fresh = provider.history('TEST.NS', period='1y')
+    cache.put(('history', 'TEST.NS'), fresh.iloc[:-1], expires_at=time.time() - 1, period='1y')
+
+    release = threading.Event()
+    updates = []
+
+    def update_price_store(symbol, period):
+        updates.append(period)
+        release.wait(5)
+        return fresh
+
+    monkeypatch.setattr(fap, 'update_price_store', update_price_store)
+
+    # Both reads get the stale bars at once; only the first one queues a refresh
+    for _ in range(2):
+        assert len(fap._cached_history(cache, 'TEST.NS', '6mo')) == len(fresh) - 1
+    release.set()
+
+    assert wait_for(lambda: cache.peek(('history', 'TEST.NS'), 'expires_at') > time.time())
+    assert updates == ['1y']
+    pd.testing.assert_frame_equal(cache.lookup(('history', 'TEST.NS'))['value'], fresh)
+
+
+# Request coalescing
+def fetch_concurrently(cache, key, fetch, requests, monkeypatch):
+    """Call fetch_once for key from several threads while the first fetch is running.
+
+    fetch receives a threading.Event and must wait for it; it is set once
+    every other thread waits on the running fetch. Returns each thread's
+    result or exception.
+    """
+    waiting = []
+
+    class CountingFuture(Future):
+        def result(self, timeout=None):
+            waiting.append(threading.get_ident())
+            return super().result(timeout)
+
+    monkeypatch.setattr(fap, 'Future', CountingFuture)
+    release = threading.Event()
+    outcomes = []
+
+    def request():
+        try:
+            outcomes.append(cache.fetch_once(key, lambda: fetch(release)))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=request) for _ in range(requests)]
+    for thread in threads:
+        thread.start()
+    assert wait_for(lambda: len(waiting) == requests - 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_requests_share_one_fetch(monkeypatch):
+    cache = fap.MarketDataCache()
+    calls = []
+
+    def fetch(release):
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return 'bars'
+
+    assert fetch_concurrently(cache, ('history', 'TEST.NS'), fetch, 8, monkeypatch) == ['bars'] * 8
+    assert len(calls) == 1
+
+
+def test_failed_fetch_reaches_every_waiter(monkeypatch):
+    cache = fap.MarketDataCache()
+
+    def fetch(release):
+        release.wait(5)
+        raise ConnectionError("upstream down")
+
+    outcomes = fetch_concurrently(cache, ('history', 'TEST.NS'), fetch, 4, monkeypatch)
+    assert len(outcomes) == 4 and all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+    # The failure is not remembered: the next request fetches again
+    assert cache.fetch_once(('history', 'TEST.NS'), lambda: 'bars') == 'bars'
+
+
+# Replay provider
+def outcomes(provider, calls):
+    """Return which of several (cheap) news requests succeed."""
+    succeeded = []
+    for _ in range(calls):
+        try:
+            provider.news('TEST.NS')
+            succeeded.append(True)
+        except ConnectionError:
+            succeeded.append(False)
+    return succeeded
+
+
+def test_replay_failures_are_injected_reproducibly(tmp_path):
+    always_failing = fap.ReplayProvider(str(tmp_path), failure_rate=1.0)
+    for call in (lambda: always_failing.history('TEST.NS', period='1mo'), lambda: always_failing.download(['TEST.NS'], period='1mo'),
+                 lambda: always_failing.info('TEST.NS'), lambda: always_failing.news('TEST.NS')):
+        with pytest.raises(ConnectionError):
+            call()
+
+    flaky = outcomes(fap.ReplayProvider(str(tmp_path), failure_rate=0.5, seed=3), 50)
+    assert 0 < sum(flaky) < 50
+    assert outcomes(fap.ReplayProvider(str(tmp_path), failure_rate=0.5, seed=3), 50) == flaky
+
+    slow = fap.ReplayProvider(str(tmp_path), latency=0.05)
+    started = time.monotonic()
+    slow.history('TEST.NS', period='1mo')
+    assert time.monotonic() - started >= 0.05
+
+
+def test_retries_recover_from_injected_failures(tmp_path, monkeypatch):
+    provider = fap.ReplayProvider(str(tmp_path), failure_rate=0.5, seed=3)
+    failures = outcomes(fap.ReplayProvider(str(tmp_path), failure_rate=0.5, seed=3), 50).index(True)
+    assert failures > 0  # the seed starts with at least one failure
+    problems = []
+    monkeypatch.setattr(fap, 'backoff_delay', lambda attempt: 0)
+    monkeypatch.setattr(fap, 'report_fetch_problem', lambda level, message: problems.append(message))
+
+    history = fap.fetch_with_retries(lambda: provider.history('TEST.NS', period='1mo'), "data for TEST.NS", max_retries=failures + 1)
+    assert not history.empty
+    assert len(problems) == failures and all("Injected failure" in problem for problem in problems)
+
+
+# NSE calendar
+@pytest.fixture
+def republic_day(monkeypatch):
+    """Friday 26 January 2024 as the only exchange holiday."""
+    monkeypatch.setattr(fap, 'load_nse_holidays', lambda: frozenset({date(2024, 1, 26)}))
+
+
+def ist(day, hour, minute=0):
+    """Return a time in IST in January 2024."""
+    return datetime(2024, 1, day, hour, minute, tzinfo=fap.IST)
+
+
+@pytest.mark.parametrize('now, is_open', [
+    (ist(22, 9, 14), False),
+    (ist(22, 9, 15), True),
+    (ist(22, 15, 45), True),  # the daily bar can still change until settlement
+    (ist(22, 16, 0), False),
+    (ist(26, 11), False),  # holiday
+    (ist(27, 11), False)  # Saturday
+])
+def test_market_hours(republic_day, now, is_open):
+    assert fap.is_market_open(now) == is_open
+
+
+def test_last_session_settlement_skips_holidays_and_weekends(republic_day):
+    assert fap.last_session_settlement(ist(25, 16, 0)) == ist(25, 16, 0)
+    assert fap.last_session_settlement(ist(25, 15, 59)) == ist(24, 16, 0)
+    assert fap.last_session_settlement(ist(29, 10)) == ist(25, 16, 0)
+
+
+def test_cache_expiry_follows_the_session(republic_day):
+    during_session = ist(22, 11)
+    assert fap.cache_expiry('history', during_session) == during_session.timestamp() + fap.INTRADAY_TTL
+    # After settlement nothing changes until the next session opens, after the holiday and weekend
+    for kind in ('history', 'intraday'):
+        assert fap.cache_expiry(kind, ist(25, 17)) == ist(29, 9, 15).timestamp()
+        assert fap.cache_expiry(kind, ist(29, 8)) == ist(29, 9, 15).timestamp()
+
+
+# Bounded cache
+def frame(value):
+    """Return a 1000-bar frame filled with value."""
+    return pd.DataFrame({'Close': np.full(1000, float(value))}, index=pd.bdate_range("2020-01-01", periods=1000))
+
+
+def test_least_recently_used_entries_are_evicted():
+    nbytes = fap._value_nbytes(frame(0))
+    cache = fap.MarketDataCache(max_bytes=2 * nbytes + nbytes // 2)
+    cache.put('a', frame(1))
+    cache.put('b', frame(2))
+    assert cache.lookup('a') is not None  # 'b' is now the least recently used
+    cache.put('c', frame(3))
+
+    assert cache.lookup('b') is None
+    assert cache.lookup('a')['value']['Close'].iloc[0] == 1
+    assert cache.lookup('c')['value']['Close'].iloc[0] == 3
+    assert cache.stats() == dict(hits=3, misses=1, stale=0, evictions=1, entries=2, bytes=2 * nbytes, max_bytes=cache.max_bytes)
+
+    # Replacing an entry releases the bytes of the old value
+    cache.put('a', frame(4))
+    assert cache.stats()['bytes'] == 2 * nbytes and cache.stats()['evictions'] == 1
+
+    # A value larger than the whole cache is still kept, on its own
+    cache.put('big', pd.concat([frame(5)] * 3))
+    assert cache.stats()['entries'] == 1 and cache.lookup('big') is not None
+
+
+def test_stale_reads_are_counted():
+    cache = fap.MarketDataCache()
+    cache.put('a', frame(1), expires_at=time.time() - 1)
+    assert not cache.is_fresh(cache.lookup('a'))
+    assert cache.stats()['stale'] == 1
+
+
+def test_lookups_do_not_change_the_cached_frame():
+    cache = fap.MarketDataCache()
+    cache.put('a', frame(1))
+    view = cache.lookup('a')['value']
+    view['Close'] = view['Close'] * 2
+    view['SMA_50'] = view['Close'].rolling(50).mean()
+
+    cached = cache.lookup('a')['value']
+    assert list(cached.columns) == ['Close'] and (cached['Close'] == 1).all()
@@ -0,0 +1,80 @@
+"""Reference checks for the portfolio simulation and optimizer."""
+import numpy as np
+import pytest
+from scipy.optimize import minimize
+
+import financial_advisor_pro as fap
+
+
+# Portfolio optimization
+@pytest.fixture
+def market():
+    rng = np.random.default_rng(3)
+    daily = rng.normal(0.0006, 0.015, (750, 12)) + rng.normal(0, 0.01, (750, 1))
+    return daily.mean(axis=0) * 252, np.cov(daily.T) * 252
+
+
+def test_simulated_portfolios_match_loop(market):
+    mean_returns, cov_matrix = market
+    portfolios = fap.simulate_portfolios(mean_returns, cov_matrix, 2000, risk_free_rate=0.05)
+
+    np.random.seed(42)
+    for i in range(2000):
+        weights = np.random.random(len(mean_returns))
+        weights /= np.sum(weights)
+        portfolio_return = weights @ mean_returns
+        volatility = np.sqrt(weights @ cov_matrix @ weights)
+        np.testing.assert_allclose(
+            portfolios.iloc[i].to_numpy(), [portfolio_return, volatility, (portfolio_return - 0.05) / volatility], rtol=1e-9
+        )
+
+
+@pytest.mark.parametrize('bounds', [(0.0, 1.0), (0.02, 0.2)])
+def test_optimizer_beats_multistart_search(market, bounds):
+    mean_returns, cov_matrix = market
+    bounds = [bounds] * len(mean_returns)
+    lower, upper = np.array(bounds).T
+    risk_free_rate = 0.05
+    rng = np.random.default_rng(0)
+
+    def multistart(objective):
+        best = np.inf
+        for _ in range(10):
+            start = np.clip(rng.dirichlet(np.ones(len(mean_returns))), lower, upper)
+            result = minimize(objective, start / start.sum(), method='SLSQP', bounds=bounds,
+                              constraints=[{'type': 'eq', 'fun': lambda w: w.sum() - 1}], options={'ftol': 1e-14, 'maxiter': 1000})
+            best = min(best, result.fun)
+        return best
+
+    references = {
+        "Maximize Sharpe Ratio": (lambda w: -(mean_returns @ w - risk_free_rate) / np.sqrt(w @ cov_matrix @ w), lambda r, v, s: -s),
+        "Maximize Return": (lambda w: -(mean_returns @ w), lambda r, v, s: -r),
+        "Minimize Volatility": (lambda w: np.sqrt(w @ cov_matrix @ w), lambda r, v, s: v)
+    }
+    for goal, (objective, score) in references.items():
+        weights = fap.optimize_portfolio(mean_returns, cov_matrix, goal, bounds, risk_free_rate)
+        assert weights.sum() == pytest.approx(1)
+        assert np.all(weights >= lower - 1e-9) and np.all(weights <= upper + 1e-9)
+        performance = fap.portfolio_performance(weights, mean_returns, cov_matrix, risk_free_rate)
+        assert score(*performance) <= multistart(objective) + 1e-7, goal
+
+
+def test_frontier_is_efficient(market):
+    mean_returns, cov_matrix = market
+    bounds = [(0.0, 1.0)] * len(mean_returns)
+    frontier = fap.efficient_frontier(mean_returns, cov_matrix, bounds, points=50)
+    assert len(frontier) == 50
+    assert frontier['Return'].is_monotonic_increasing
+    assert frontier['Volatility'].is_monotonic_increasing
+
+    # No random long-only portfolio may be less volatile than the frontier at its return
+    portfolios = fap.simulate_portfolios(mean_returns, cov_matrix, 20000)
+    inside = portfolios[portfolios['Return'].between(frontier['Return'].min(), frontier['Return'].max())]
+    frontier_volatility = np.interp(inside['Return'], frontier['Return'], frontier['Volatility'])
+    assert np.all(inside['Volatility'] >= frontier_volatility - 1e-3)
+
+
+def test_infeasible_bounds_are_rejected(market):
+    mean_returns, cov_matrix = market
+    with pytest.raises(ValueError):
+        fap.optimize_portfolio(mean_returns, cov_matrix, "Minimize Volatility", [(0.0, 0.05)] * len(mean_returns))